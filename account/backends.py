@@ -0,0 +1,83 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend, UserModel
+from django.core.cache import cache
+from django.db import router
+
+USER_KEY = 'auth_user:{}'
+# Password hash is not copied to the cache, the session is checked with the saved session auth hash.
+USER_EXCLUDED_FIELDS = ('password', )
+
+
+def user_row(user) -> dict:
+    """
+    Function for getting the cached part of the user.
+
+    :param user: User unit loaded from the database.
+    :return: Dict with fields of the user without the password (fields) and session auth hash.
+    """
+    return {
+        'fields': {field.attname: getattr(user, field.attname) for field in user._meta.concrete_fields
+                   if field.attname not in USER_EXCLUDED_FIELDS},
+        'session_auth_hash': user.get_session_auth_hash(),
+    }
+
+
+def user_from_row(row: dict):
+    """
+    Function for building the user from its cached part.
+
+    Password is a deferred field, it is loaded from the database when it is read and is not
+    overwritten by save(). Until then the session is checked with the cached session auth hash.
+
+    :param row: Dict from user_row().
+    :return: User unit.
+    """
+    fields = row['fields']
+    user = UserModel.from_db(router.db_for_read(UserModel), list(fields), list(fields.values()))
+
+    def get_session_auth_hash():
+        if 'password' in user.get_deferred_fields():
+            return row['session_auth_hash']
+        return UserModel.get_session_auth_hash(user)
+
+    user.get_session_auth_hash = get_session_auth_hash
+    return user
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    Class of the authentication backend that takes the session user from the cache.
+
+    With the cached session engine logged in user costs no queries on the common path. Cached user is
+    dropped when it is saved or deleted (account/signals.py) and lives USER_CACHE_TIMEOUT at most,
+    so changes with QuerySet.update() are seen after it. USER_CACHE_TIMEOUT 0 turns the cache off.
+
+    """
+
+    def get_user(self, user_id):
+        """
+        Function for getting active user of the session.
+
+        :param user_id: Primary key from the session.
+        :return: User or None.
+        """
+        if not settings.USER_CACHE_TIMEOUT:
+            return super().get_user(user_id)
+        key = USER_KEY.format(user_id)
+        row = cache.get(key)
+        if row is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user_row(user), timeout=settings.USER_CACHE_TIMEOUT)
+            return user
+        user = user_from_row(row)
+        return user if self.user_can_authenticate(user) else None
+
+
+def forget_user(user_id) -> None:
+    """
+    Function for deleting cached user, it is loaded from the database on the next request.
+
+    :param user_id: Primary key of the user.
+    """
+    cache.delete(USER_KEY.format(user_id))
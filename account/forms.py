@@ -37,14 +37,23 @@ class UserLogin(forms.Form):
     """
     Class for creating correct form User Login on the page.
 
+    user_cache - User authenticated by clean(), login view takes it with get_user(), so the password
+    is hashed only once per attempt.\n
+
     """
     username = forms.CharField(widget=forms.TextInput())
     password = forms.CharField(widget=forms.PasswordInput())
 
+    def __init__(self, *args, request=None, **kwargs):
+        self.request = request
+        self.user_cache = None
+        super().__init__(*args, **kwargs)
+
     def clean(self):
         """
         Function checked for equality password and login with data in database.
 
+        authenticate() already checks the password with one hash, so the result is not checked again.
         If all OK - return function clear.
         Other way will return ValidationError.
 
@@ -54,9 +63,17 @@ class UserLogin(forms.Form):
         password = self.cleaned_data.get('password')
 
         if username and password:
-            user = authenticate(username=username, password=password)
-            if not user or not user.check_password(password):
+            self.user_cache = authenticate(self.request, username=username, password=password)
+            if self.user_cache is None:
                 raise forms.ValidationError('Error in Login or Password')
         else:
             raise forms.ValidationError('Error in Login or Password')
         return super().clean()
+
+    def get_user(self):
+        """
+        Function for getting user authenticated during the validation.
+
+        :return: User or None if the form is not valid.
+        """
+        return self.user_cache
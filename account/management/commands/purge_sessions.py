@@ -0,0 +1,35 @@
+import time
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    """
+    Command for deleting expired sessions in small batches, each batch is a short transaction,
+    so the session table is not locked for long time.
+
+    Usage: python manage.py purge_sessions [--batch-size 1000] [--pause 0.1]
+    """
+    help = 'Delete expired sessions from the database in bounded batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.SESSION_PURGE_BATCH_SIZE,
+                            help='Sessions deleted by one query.')
+        parser.add_argument('--pause', type=float, default=0,
+                            help='Seconds between batches, gives way to other queries.')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        expired = Session.objects.filter(expire_date__lt=now).order_by('pk')
+        deleted = 0
+        while True:
+            keys = list(expired.values_list('pk', flat=True)[:options['batch_size']])
+            if not keys:
+                break
+            deleted += Session.objects.filter(pk__in=keys).delete()[0]
+            if options['pause']:
+                time.sleep(options['pause'])
+        self.stdout.write(f'{deleted} expired sessions deleted.')
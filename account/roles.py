@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.core.cache import cache
+
+MANAGER_ROLE = 'manager'
+ROLES_KEY = 'user_roles:{}'
+# Attribute of the user object, so roles are taken from the cache once per request.
+ROLES_ATTRIBUTE = '_cached_roles'
+
+
+def load_roles(user) -> frozenset:
+    """
+    Function for loading names of the user groups from the database.
+
+    :param user: User unit.
+    :return: Set of group names.
+    """
+    return frozenset(user.groups.values_list('name', flat=True))
+
+
+def user_roles(user) -> frozenset:
+    """
+    Function for getting names of the user groups without query to the database.
+
+    Roles are kept in the cache per user (ROLE_CACHE_TIMEOUT) and on the user object per request,
+    anonymous user has no roles.
+
+    :param user: Session user unit.
+    :return: Set of group names.
+    """
+    if not user.is_authenticated:
+        return frozenset()
+    roles = getattr(user, ROLES_ATTRIBUTE, None)
+    if roles is None:
+        key = ROLES_KEY.format(user.pk)
+        roles = cache.get(key)
+        if roles is None:
+            roles = load_roles(user)
+            cache.set(key, roles, timeout=settings.ROLE_CACHE_TIMEOUT)
+        setattr(user, ROLES_ATTRIBUTE, roles)
+    return roles
+
+
+def has_role(user, role: str) -> bool:
+    """
+    Checked if user have group with this name in his group list.
+
+    :param user: Session user unit.
+    :param role: Group name.
+    :return: True or False.
+    """
+    return role in user_roles(user)
+
+
+def is_manager(user) -> bool:
+    """
+    Checked if user have group 'manager' in his group list.
+
+    :param user: Session user unit.
+    :return: True or False.
+    """
+    return has_role(user, MANAGER_ROLE)
+
+
+def forget_roles(*user_ids) -> None:
+    """
+    Function for deleting cached roles of the users, they are loaded again on the next request.
+
+    :param user_ids: Primary keys of the users.
+    """
+    if user_ids:
+        cache.delete_many([ROLES_KEY.format(user_id) for user_id in user_ids])
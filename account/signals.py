@@ -0,0 +1,54 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.contrib.auth.signals import user_logged_in
+from django.db.models.signals import m2m_changed, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from .backends import forget_user
+from .roles import forget_roles, user_roles
+
+User = get_user_model()
+
+
+@receiver(user_logged_in, dispatch_uid='roles_user_logged_in')
+def roles_logged_in(sender, request, user, **kwargs):
+    """
+    Receiver for loading roles at login, so the following pages take them from the cache.
+    """
+    forget_roles(user.pk)
+    user_roles(user)
+
+
+@receiver(m2m_changed, sender=User.groups.through, dispatch_uid='roles_groups_changed')
+def roles_groups_changed(sender, instance, action, reverse, model, pk_set, **kwargs):
+    """
+    Receiver for changes of the group membership from both sides (user.groups and group.user_set).
+    """
+    if action not in ('post_add', 'post_remove', 'pre_clear', 'post_clear'):
+        return
+    if not reverse:
+        forget_roles(instance.pk)
+    elif action == 'pre_clear':
+        # Members are unknown after the clear.
+        forget_roles(*instance.user_set.values_list('pk', flat=True))
+    elif pk_set:
+        forget_roles(*pk_set)
+
+
+@receiver(post_save, sender=Group, dispatch_uid='roles_group_saved')
+@receiver(pre_delete, sender=Group, dispatch_uid='roles_group_deleted')
+def roles_group_changed(sender, instance, created=False, raw=False, **kwargs):
+    """
+    Receiver for renamed and deleted groups, roles of their members are reloaded.
+    """
+    if not created and not raw:
+        forget_roles(*instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=User, dispatch_uid='cached_user_saved')
+@receiver(post_delete, sender=User, dispatch_uid='cached_user_deleted')
+def cached_user_changed(sender, instance, **kwargs):
+    """
+    Receiver for dropping cached session user (account/backends.py) when the user is changed.
+    """
+    forget_user(instance.pk)
@@ -1,3 +1,99 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user, get_user_model
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from site_reva_a.testing import ViewBudgetMixin
+from .backends import USER_KEY, CachedModelBackend
+
+User = get_user_model()
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.PBKDF2PasswordHasher'])
+class LoginHashCountTest(TestCase):
+    """
+    Password hash is the most expensive part of the login, each attempt must compute it only once.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='john', password='secret-password')
+
+    def post_login(self, username, password):
+        """
+        Function for posting the login form while counting hash computations.
+
+        :return: Tuple (response, number of hashes).
+        """
+        with mock.patch.object(PBKDF2PasswordHasher, 'encode', autospec=True,
+                               side_effect=PBKDF2PasswordHasher.encode) as encode:
+            response = self.client.post('/login/', {'username': username, 'password': password})
+        return response, encode.call_count
+
+    def test_successful_login(self):
+        response, hashes = self.post_login('john', 'secret-password')
+        self.assertRedirects(response, '/', fetch_redirect_response=False)
+        self.assertEqual(int(self.client.session['_auth_user_id']), self.user.pk)
+        self.assertEqual(hashes, 1)
+
+    def test_wrong_password(self):
+        response, hashes = self.post_login('john', 'wrong-password')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('_auth_user_id', self.client.session)
+        self.assertEqual(hashes, 1)
+
+    def test_unknown_user(self):
+        response, hashes = self.post_login('nobody', 'secret-password')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(hashes, 1)
+
+
+class ViewBudgetTest(ViewBudgetMixin, TestCase):
+    """
+    Login and registration pages stay within their budgets.
+    """
+
+    def test_login_view(self):
+        self.assert_within_budget('/login/', 'login_view')
+
+    def test_registration_view(self):
+        self.assert_within_budget('/registration/', 'registration_view')
+
+
+@override_settings(USER_CACHE_TIMEOUT=300)
+class CachedUserTest(TestCase):
+    """
+    Session user is taken from the cache without the password hash, changed password ends other sessions.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='john', password='secret-password')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def test_password_not_cached(self):
+        self.client.get('/login/')
+        row = cache.get(USER_KEY.format(self.user.pk))
+        self.assertNotIn('password', row['fields'])
+        self.assertNotIn(self.user.password, str(row))
+        user = CachedModelBackend().get_user(self.user.pk)
+        user.first_name = 'John'
+        user.save()
+        self.assertTrue(User.objects.get(pk=self.user.pk).check_password('secret-password'))
+
+    def test_session_user_cached(self):
+        self.client.get('/login/')
+        with self.assertNumQueries(0):
+            self.assertEqual(CachedModelBackend().get_user(self.user.pk), self.user)
+        self.assertEqual(get_user(self.client).pk, self.user.pk)
+
+    def test_changed_password(self):
+        self.client.get('/login/')
+        self.user.set_password('new-password')
+        self.user.save()
+        self.assertFalse(get_user(self.client).is_authenticated)
@@ -1,7 +1,7 @@
 from django.shortcuts import render, redirect
 from .forms import UserRegistration, UserLogin
-from main_page.models import InformationInContactUs, Footer
-from django.contrib.auth import login, authenticate, logout
+from .roles import is_manager
+from django.contrib.auth import login, logout
 
 
 def registration_view(request):
@@ -9,8 +9,6 @@ def registration_view(request):
     View function of the registration page. Processed POST and GET requests.
     
     form - Registration form.\n
-    information_in_contact_us - Object model InformationInContactUs.\n
-    footer - Footer object model.\n
     user_manager - Checked if user have group 'manager' in his group list.\n
     user_auth - Is user authenticated or not.\n
 
@@ -19,24 +17,17 @@ def registration_view(request):
     
     """
     form = UserRegistration(request.POST or None)
-    information_in_contact_us = InformationInContactUs.objects.get()
-    footer = Footer.objects.get()
-    user_manager = request.user.groups.filter(name='manager').exists()
+    user_manager = is_manager(request.user)
     user_auth = request.user.is_authenticated
     if form.is_valid():
         new_user = form.save(commit=False)
         new_user.set_password(form.cleaned_data['password'])
         new_user.save()
-        data = {
-            'user': new_user,
-            'information_in_contact_us': information_in_contact_us,
-            'footer': footer}
+        data = {'user': new_user}
         return render(request, 'registration_done.html', context=data)
 
     data = {
         'form': form,
-        'information_in_contact_us': information_in_contact_us,
-        'footer': footer,
         'user_manager': user_manager,
         'user_auth': user_auth
     }
@@ -47,35 +38,26 @@ def login_view(request):
     """
     View function of the login page. Processed POST and GET requests.
     
-    form - form from model UserLogin with GET request or None.\n
+    form - form from model UserLogin with GET request or None, it keeps the authenticated user.\n
     next_get - Next page parameters.\n
-    information_in_contact_us - Object model InformationInContactUs.\n
-    footer - footer - Footer object model.\n
     user_manager - Checked if user have group 'manager' in his group list.\n
     user_auth - Is user authenticated or not.\n
     
     :param request: POST or GET request.
     :return: Render of the HTML-page with context.
     """
-    form = UserLogin(request.POST or None)
+    form = UserLogin(request.POST or None, request=request)
     next_get = request.GET.get('next')
-    information_in_contact_us = InformationInContactUs.objects.get()
-    footer = Footer.objects.get()
-    user_manager = request.user.groups.filter(name='manager').exists()
+    user_manager = is_manager(request.user)
     user_auth = request.user.is_authenticated
     if form.is_valid():
-        username = form.cleaned_data.get('username')
-        password = form.cleaned_data.get('password')
-        user = authenticate(username=username, password=password)
-        login(request, user)
+        login(request, form.get_user())
 
         next_post = request.POST.get('next')
         return redirect(next_get or next_post or '/')
 
     data = {
         'form': form,
-        'information_in_contact_us': information_in_contact_us,
-        'footer': footer,
         'user_manager': user_manager,
         'user_auth': user_auth
     }
@@ -0,0 +1,17 @@
+import os
+
+# gunicorn reads this file from the working directory.
+# With sync workers every worker thread keeps its own persistent database connection (DATABASE_CONN_MAX_AGE),
+# so workers * threads connections are open, keep it below max_connections of the database.
+# Uvicorn workers (ASGI_SERVER) run sync code in executor threads, their number is not limited by threads,
+# so DATABASE_CONN_MAX_AGE is 0 by default and connections are closed after each request.
+workers = int(os.getenv("WEB_CONCURRENCY", 1))
+threads = int(os.getenv("GUNICORN_THREADS", 1))
+
+# ASGI_SERVER=True serves site_reva_a.asgi with uvicorn workers (pip install uvicorn). Use it for the async views:
+# manager live feed (MANAGER_FEED_ENABLED) and ASYNC_MAIN_PAGE, sync workers hold a thread while they wait.
+if os.getenv("ASGI_SERVER", "False") == "True":
+    wsgi_app = "site_reva_a.asgi:application"
+    worker_class = "uvicorn.workers.UvicornWorker"
+else:
+    wsgi_app = "site_reva_a.wsgi:application"
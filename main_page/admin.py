@@ -1,7 +1,7 @@
 from django.contrib import admin
 from .models import Category, Dishes, Events, PhotoToGallery, AboutUs, \
     BlockOfInformation, CrewMember, CustomerFeedback, HeroSection, \
-    UserReservation, ThisIsForTest, ContactUs, InformationInContactUs, Footer
+    UserReservation, ThisIsForTest, ContactUs, InformationInContactUs, Footer, SlotCapacity, SlotOccupancy
 
 
 @admin.register(Category)
@@ -89,7 +89,38 @@ class HeroSectionAdmin(admin.ModelAdmin):
 
 
 # Register other models without extra-settings.
-admin.site.register(UserReservation)
+@admin.register(UserReservation)
+class UserReservationAdmin(admin.ModelAdmin):
+    """
+    Registering reservation in admin section, added some visible filters.
+    """
+    list_display = ['name', 'phone', 'date_reservation', 'time_reservation', 'persons', 'is_processed', 'is_waitlisted']
+    list_filter = ('is_processed', 'is_waitlisted', 'date_reservation', )
+
+
+@admin.register(SlotCapacity)
+class SlotCapacityAdmin(admin.ModelAdmin):
+    """
+    Registering slot capacity in admin section, added edition filters.
+    """
+    list_display = ['time_slot', 'seats']
+    list_editable = ['seats', ]
+
+
+@admin.register(SlotOccupancy)
+class SlotOccupancyAdmin(admin.ModelAdmin):
+    """
+    Registering slot occupancy in admin section, read only: the index is updated by reservations.
+    """
+    list_display = ['date_reservation', 'time_slot', 'seats_taken']
+    list_filter = ('date_reservation', )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
 admin.site.register(ThisIsForTest)
 admin.site.register(ContactUs)
 admin.site.register(InformationInContactUs)
@@ -0,0 +1,256 @@
+import os
+import posixpath
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+CRITICAL_CSS_NAME = 'critical.css'
+
+CSS_URL_RE = re.compile(r'''url\(\s*(['"]?)(.*?)\1\s*\)''', re.S)
+CSS_TOKEN_RE = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|url\([^)]*\))|(/\*.*?\*/)|(\s+)''', re.S)
+SOURCE_MAP_RE = re.compile(r'^\s*(//|/\*)# sourceMappingURL=.*$', re.M)
+CHARSET_RE = re.compile(r'@charset\s+"[^"]*"\s*;', re.I)
+CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+# Whitespace around these characters is not needed.
+CSS_SEPARATORS = '{};,'
+
+
+def bundle_path(name: str) -> str:
+    """
+    Function for getting static path of the bundle.
+
+    :param name: Name of the bundle from ASSET_BUNDLES.
+    :return: Path relative to the static directory, for example 'assets/bundles/site.css'.
+    """
+    return posixpath.join(settings.ASSET_BUNDLE_DIR, name)
+
+
+def read_static(path: str) -> str:
+    """
+    Function for reading source file found by staticfiles finders.
+
+    :param path: Path relative to the static directory.
+    :return: Content of the file.
+    """
+    full_path = finders.find(path)
+    if full_path is None:
+        raise FileNotFoundError(f'Static file {path} is not found')
+    with open(full_path, encoding='utf-8') as file:
+        return file.read()
+
+
+def is_relative_url(url: str) -> bool:
+    """
+    Function for checking that url() of the stylesheet points to the file near it.
+    """
+    return bool(url) and not url.startswith(('data:', 'http:', 'https:', '//', '/', '#'))
+
+
+def rebase_css_urls(css: str, source: str, target_dir: str) -> str:
+    """
+    Function for rewriting relative url() of the stylesheet, so they work from another directory.
+
+    :param css: Content of the stylesheet.
+    :param source: Static path of the stylesheet.
+    :param target_dir: Static directory of the bundle.
+    :return: Stylesheet with rewritten urls.
+    """
+    source_dir = posixpath.dirname(source)
+
+    def rebase(match):
+        quote, url = match.groups()
+        if not is_relative_url(url):
+            return match.group(0)
+        path = posixpath.normpath(posixpath.join(source_dir, url))
+        return f'url({quote}{posixpath.relpath(path, target_dir)}{quote})'
+
+    return CSS_URL_RE.sub(rebase, css)
+
+
+def minify_css(css: str) -> str:
+    """
+    Function for removing comments and unnecessary whitespace from the stylesheet.
+
+    rcssmin is used if it is installed. Strings and url() are kept as they are, /*! comments with licenses
+    are kept too.
+
+    :param css: Content of the stylesheet.
+    :return: Minified stylesheet.
+    """
+    if rcssmin is not None:
+        return rcssmin.cssmin(css, keep_bang_comments=True)
+
+    def replace(match):
+        literal, comment, _ = match.groups()
+        if literal:
+            return literal
+        if comment:
+            return comment if comment.startswith('/*!') else ''
+        before = css[match.start() - 1] if match.start() else ';'
+        after = css[match.end()] if match.end() < len(css) else ';'
+        return '' if before in CSS_SEPARATORS or after in CSS_SEPARATORS else ' '
+
+    return CSS_TOKEN_RE.sub(replace, css).strip()
+
+
+def minify_js(js: str) -> str:
+    """
+    Function for minifying script with rjsmin if it is installed, other way script is returned as is
+    (vendor scripts are minified already).
+
+    :param js: Content of the script.
+    :return: Minified script.
+    """
+    if rjsmin is not None:
+        return rjsmin.jsmin(js, keep_bang_comments=True)
+    return js
+
+
+def split_rules(css: str):
+    """
+    Generator of the top level rules of the stylesheet.
+
+    :param css: Minified stylesheet.
+    :return: Tuples (prelude, body), statements like @charset have None body.
+    """
+    depth = start = body_start = 0
+    quote = None
+    for index, char in enumerate(css):
+        if quote:
+            if char == quote and css[index - 1] != '\\':
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char == '{':
+            if not depth:
+                body_start = index + 1
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if not depth:
+                yield CSS_COMMENT_RE.sub('', css[start:body_start - 1]).strip(), css[body_start:index]
+                start = index + 1
+        elif char == ';' and not depth:
+            yield css[start:index].strip(), None
+            start = index + 1
+
+
+def is_critical_selector(selector: str, critical_selectors) -> bool:
+    """
+    Function for checking that selector styles above-the-fold elements.
+
+    Critical selector ending with '-' matches as prefix ('.carousel-' matches '.carousel-item'), other ones
+    match only the whole first name ('.carousel' matches '.carousel.slide', but not '.carousel-item').
+
+    :param selector: Selector of the rule.
+    :param critical_selectors: ASSET_CRITICAL_SELECTORS.
+    :return: True or False.
+    """
+    selector = selector.strip()
+    for critical in critical_selectors:
+        if critical.endswith('-'):
+            if selector.startswith(critical):
+                return True
+        elif re.match(re.escape(critical) + r'(?![\w-])', selector):
+            return True
+    return False
+
+
+def critical_css(css: str, critical_selectors) -> str:
+    """
+    Function for extracting rules of the above-the-fold elements from the minified stylesheet.
+
+    Rules inside @media are checked too, other at-rules (@font-face, @keyframes) are left for the full bundle.
+
+    :param css: Minified stylesheet.
+    :param critical_selectors: ASSET_CRITICAL_SELECTORS.
+    :return: Critical stylesheet.
+    """
+    rules = []
+    for prelude, body in split_rules(css):
+        if body is None:
+            continue
+        if prelude.startswith('@media'):
+            inner = critical_css(body, critical_selectors)
+            if inner:
+                rules.append(f'{prelude}{{{inner}}}')
+        elif not prelude.startswith('@'):
+            if any(is_critical_selector(selector, critical_selectors) for selector in prelude.split(',')):
+                rules.append(f'{prelude}{{{body}}}')
+    return ''.join(rules)
+
+
+def build_css(name: str, sources) -> tuple:
+    """
+    Function for building stylesheet bundle.
+
+    :param name: Name of the bundle.
+    :param sources: Static paths of the stylesheets.
+    :return: Tuple (bundle, critical part).
+    """
+    target_dir = posixpath.dirname(bundle_path(name))
+    parts = []
+    for source in sources:
+        css = CHARSET_RE.sub('', SOURCE_MAP_RE.sub('', read_static(source)))
+        parts.append(minify_css(rebase_css_urls(css, source, target_dir)))
+    bundle = '@charset "UTF-8";' + ''.join(parts)
+    return bundle, critical_css(''.join(parts), settings.ASSET_CRITICAL_SELECTORS)
+
+
+def build_js(sources) -> str:
+    """
+    Function for building script bundle, scripts are separated with semicolon.
+
+    :param sources: Static paths of the scripts.
+    :return: Bundle.
+    """
+    return '\n;\n'.join(minify_js(SOURCE_MAP_RE.sub('', read_static(source))) for source in sources)
+
+
+def write_asset(path: str, content: str) -> str:
+    """
+    Function for writing built file to ASSET_BUILD_ROOT.
+
+    :param path: Static path of the file.
+    :param content: Content of the file.
+    :return: Full path of the file.
+    """
+    full_path = os.path.join(settings.ASSET_BUILD_ROOT, posixpath.relpath(path, settings.ASSET_BUNDLE_DIR))
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path, 'w', encoding='utf-8') as file:
+        file.write(content)
+    return full_path
+
+
+def build_bundles() -> list:
+    """
+    Function for building all bundles from ASSET_BUNDLES and critical stylesheet from the first CSS bundle.
+
+    Bundles are written to the static directory, collectstatic adds content hashes to their names and
+    compresses them (CompressedManifestStaticFilesStorage).
+
+    :return: List of full paths of the written files.
+    """
+    written = []
+    critical = None
+    for name, sources in settings.ASSET_BUNDLES.items():
+        if name.endswith('.css'):
+            bundle, bundle_critical = build_css(name, sources)
+            critical = bundle_critical if critical is None else critical
+        else:
+            bundle = build_js(sources)
+        written.append(write_asset(bundle_path(name), bundle))
+    if critical is not None:
+        written.append(write_asset(bundle_path(CRITICAL_CSS_NAME), critical))
+    return written
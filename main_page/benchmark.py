@@ -0,0 +1,176 @@
+import datetime
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db import connections
+from django.test import Client
+from django.utils import timezone
+
+from account.roles import MANAGER_ROLE
+from .slots import schedule
+
+BENCHMARK_USERNAME = 'benchmark_manager'
+
+
+def reservation_data(index: int) -> dict:
+    """
+    Function for getting valid reservation form data, every request takes the next time slot,
+    so slots are filled evenly.
+
+    :param index: Number of the request.
+    :return: POST data.
+    """
+    slots = schedule()
+    date = timezone.localdate() + datetime.timedelta(days=1 + index // len(slots))
+    return {
+        'name': 'Benchmark',
+        'email': 'benchmark@mail.com',
+        'phone': '050 123 4567',
+        'date_reservation': date.isoformat(),
+        'time_reservation': slots[index % len(slots)].strftime('%H:%M'),
+        'persons': 2,
+        'message': 'Benchmark reservation',
+    }
+
+
+# Pages driven by the benchmark.
+# method - HTTP method.\n
+# path - URL of the page.\n
+# manager - Clients are logged in as manager.\n
+# data - Function for getting POST data by number of the request.\n
+# status - Expected status code, other responses (and exceptions) are counted as errors.\n
+# writes - Requests write to the database.\n
+SCENARIOS = {
+    'main_page': {'method': 'get', 'path': '/', 'manager': False, 'data': None, 'status': 200, 'writes': False},
+    'login': {'method': 'get', 'path': '/login/', 'manager': False, 'data': None, 'status': 200, 'writes': False},
+    'registration': {'method': 'get', 'path': '/registration/', 'manager': False, 'data': None, 'status': 200,
+                     'writes': False},
+    'manager_reservations': {'method': 'get', 'path': '/manager/reservations/', 'manager': True, 'data': None,
+                             'status': 200, 'writes': False},
+    'reservation_post': {'method': 'post', 'path': '/', 'manager': False, 'data': reservation_data, 'status': 302,
+                         'writes': True},
+}
+
+
+def benchmark_manager():
+    """
+    Function for getting user from 'manager' group for the manager pages.
+
+    :return: User.
+    """
+    user, _ = get_user_model().objects.get_or_create(username=BENCHMARK_USERNAME)
+    group, _ = Group.objects.get_or_create(name=MANAGER_ROLE)
+    user.groups.add(group)
+    return user
+
+
+class QueryCounter:
+    """
+    Database execute wrapper, counts queries of one request.
+    """
+
+    def __init__(self):
+        self.queries = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+
+def percentile(sorted_values: list, percent: int) -> float:
+    """
+    Function for getting percentile with nearest-rank method.
+
+    :param sorted_values: Sorted list of values.
+    :param percent: Percent from 1 to 100.
+    :return: Value.
+    """
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[rank - 1]
+
+
+def run_scenario(name: str, requests: int, concurrency: int, warmup: int = 0) -> dict:
+    """
+    Function for sending requests of the scenario from concurrent clients.
+
+    Every thread has its own client and database connection, manager clients are logged in once.
+
+    :param name: Name from SCENARIOS.
+    :param requests: Number of measured requests.
+    :param concurrency: Number of concurrent clients.
+    :param warmup: Number of requests sent before the measurement (caches, connections).
+    :return: Dictionary with metrics.
+    """
+    scenario = SCENARIOS[name]
+    user = benchmark_manager() if scenario['manager'] else None
+    local = threading.local()
+    counter = iter(range(warmup + requests))
+    counter_lock = threading.Lock()
+
+    def send(_):
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = Client(raise_request_exception=False)
+            if user is not None:
+                client.force_login(user)
+        with counter_lock:
+            index = next(counter)
+        data = scenario['data'](index) if scenario['data'] else None
+        queries = QueryCounter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(queries))
+            start = time.perf_counter()
+            response = getattr(client, scenario['method'])(scenario['path'], data)
+            elapsed = (time.perf_counter() - start) * 1000
+        return elapsed, queries.queries, response.status_code == scenario['status']
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(send, range(warmup)))
+        start = time.perf_counter()
+        results = list(executor.map(send, range(requests)))
+        wall_time = time.perf_counter() - start
+
+    latencies = sorted(result[0] for result in results)
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'errors': sum(not result[2] for result in results),
+        'rps': round(requests / wall_time, 2),
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'mean_ms': round(statistics.mean(latencies), 2),
+        'queries': round(statistics.mean(result[1] for result in results), 2),
+    }
+
+
+def compare_with_baseline(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Function for finding metrics that became worse than in the baseline by more than threshold.
+
+    Scenarios missing in one of the reports are skipped.
+
+    :param results: Results of the current run.
+    :param baseline: Results of the saved run.
+    :param threshold: Allowed change, 0.2 - 20%.
+    :return: List of messages about regressions.
+    """
+    regressions = []
+    for name, metrics in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if metrics['p95_ms'] > base['p95_ms'] * (1 + threshold):
+            regressions.append(f"{name}: p95_ms {base['p95_ms']} -> {metrics['p95_ms']}")
+        if metrics['rps'] < base['rps'] * (1 - threshold):
+            regressions.append(f"{name}: rps {base['rps']} -> {metrics['rps']}")
+        # Query count does not depend on the machine, any growth is a regression.
+        if metrics['queries'] > base['queries']:
+            regressions.append(f"{name}: queries {base['queries']} -> {metrics['queries']}")
+    return regressions
@@ -0,0 +1,120 @@
+import hashlib
+import uuid
+
+from django.core.cache import cache
+
+CONTENT_VERSION_KEY = 'content_version:{}'
+MAIN_PAGE_KEY = 'main_page:{}'
+FRAGMENT_KEY = 'fragment:{}:{}'
+
+
+def content_model_names() -> list:
+    """
+    Function for getting labels of the models that feed the public pages.
+
+    Reservations and contact applications are created by visitors and are not shown on the site,
+    so they are not part of the content.
+
+    :return: List of model labels in 'app_label.model_name' format.
+    """
+    from .models import CONTENT_MODELS
+    return [model._meta.label_lower for model in CONTENT_MODELS]
+
+
+def bump_content_version(model) -> None:
+    """
+    Function for marking content of the model as changed.
+
+    Every cache entry that was built with the previous version of the model becomes unreachable.
+
+    :param model: Model class or instance.
+    """
+    cache.set(CONTENT_VERSION_KEY.format(model._meta.label_lower), uuid.uuid4().hex, timeout=None)
+
+
+def content_versions(*labels) -> dict:
+    """
+    Function for getting versions of the models content with one cache round trip.
+
+    :param labels: Model labels, all content models if nothing passed.
+    :return: Dictionary with model labels and versions.
+    """
+    labels = labels or content_model_names()
+    versions = cache.get_many([CONTENT_VERSION_KEY.format(label) for label in labels])
+    return {label: versions.get(CONTENT_VERSION_KEY.format(label), '0') for label in labels}
+
+
+def content_version(*labels, versions=None) -> str:
+    """
+    Function for getting the combined version of the models content.
+
+    Versions are hashed, so cache keys stay short (memcached accepts keys up to 250 characters).
+
+    :param labels: Model labels, all content models if nothing passed.
+    :param versions: Versions already loaded with content_versions(), cache is not used then.
+    :return: Version string.
+    """
+    labels = labels or content_model_names()
+    if versions is None or not set(labels) <= versions.keys():
+        versions = content_versions(*labels)
+    return hashlib.md5('.'.join(versions[label] for label in labels).encode()).hexdigest()
+
+
+def get_cached_page(version: str):
+    """
+    Function for getting rendered main page from the cache.
+
+    :param version: Content version of the page.
+    :return: Page content in bytes or None.
+    """
+    return cache.get(MAIN_PAGE_KEY.format(version))
+
+
+def set_cached_page(version: str, content: bytes, timeout: int) -> None:
+    """
+    Function for saving rendered main page to the cache.
+
+    :param version: Content version of the page.
+    :param content: Page content in bytes.
+    :param timeout: Time to live in seconds.
+    """
+    cache.set(MAIN_PAGE_KEY.format(version), content, timeout=timeout)
+
+
+def get_cached_fragment(template_name: str, version: str):
+    """
+    Function for getting rendered section of the page from the cache.
+
+    :param template_name: Template of the section.
+    :param version: Content version of the models used in the section.
+    :return: HTML or None.
+    """
+    return cache.get(FRAGMENT_KEY.format(template_name, version))
+
+
+def set_cached_fragment(template_name: str, version: str, content: str, timeout: int) -> None:
+    """
+    Function for saving rendered section of the page to the cache.
+
+    :param template_name: Template of the section.
+    :param version: Content version of the models used in the section.
+    :param content: HTML.
+    :param timeout: Time to live in seconds.
+    """
+    cache.set(FRAGMENT_KEY.format(template_name, version), content, timeout=timeout)
+
+
+def cached_fragment_names(fragments: dict, versions: dict) -> set:
+    """
+    Function for finding sections that are in the cache with one cache round trip.
+
+    :param fragments: Dictionary with section names and tuples (template, model labels).
+    :param versions: Versions loaded with content_versions().
+    :return: Names of the cached sections.
+    """
+    keys = {
+        name: FRAGMENT_KEY.format(template_name, content_version(*labels, versions=versions))
+        for name, (template_name, labels) in fragments.items()
+    }
+    found = cache.get_many(keys.values())
+    return {name for name, key in keys.items() if key in found}
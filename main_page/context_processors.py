@@ -0,0 +1,16 @@
+from .singletons import site_content_store
+
+
+def site_content(request) -> dict:
+    """
+    Context processor with the objects that are shown on every page.
+
+    information_in_contact_us - Object model InformationInContactUs.\n
+    footer - Footer object model.\n
+    about_us - Object of the model 'About Us'.\n
+    test - test feature.\n
+
+    :param request: Any request.
+    :return: Dictionary with objects.
+    """
+    return site_content_store.get_all()
@@ -0,0 +1,229 @@
+import datetime
+import random
+from decimal import Decimal
+from io import BytesIO
+from itertools import islice
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+from PIL import Image
+
+from . import prerender
+from .cache import bump_content_version
+from .images import generate_derivatives
+from .menu import bump_menu_version
+from .models import Category, Dishes, PhotoToGallery, UserReservation, ContactUs, SlotCapacity, SlotOccupancy
+from .slots import schedule, rebuild_occupancy
+
+DATASET_PREFIX = 'Dataset'
+DATASET_EMAIL_DOMAIN = 'dataset.test'
+PLACEHOLDER_DIR = 'photo/dataset'
+PLACEHOLDER_COUNT = 12
+PLACEHOLDER_SIZE = (1280, 853)
+# Average number of reservations in one time slot, used for the number of days.
+RESERVATIONS_PER_SLOT = 8
+
+# Number of generated rows of every model.
+SCALES = {
+    'small': {'categories': 20, 'dishes': 500, 'reservations': 10_000, 'contacts': 5_000, 'photos': 100},
+    'medium': {'categories': 100, 'dishes': 2_000, 'reservations': 100_000, 'contacts': 50_000, 'photos': 500},
+    'large': {'categories': 200, 'dishes': 10_000, 'reservations': 1_000_000, 'contacts': 500_000, 'photos': 2_000},
+}
+
+WORDS = ('grilled', 'smoked', 'fresh', 'spicy', 'sweet', 'salmon', 'beef', 'chicken', 'truffle', 'tomato',
+         'basil', 'garlic', 'lemon', 'mushroom', 'cheese', 'pepper', 'honey', 'olive', 'rice', 'potato')
+NAMES = ('Anna', 'John', 'Maria', 'Oleh', 'Iryna', 'Peter', 'Sofia', 'Andrii', 'Kate', 'Max')
+
+
+def bulk_insert(model, objects, batch_size: int) -> int:
+    """
+    Function for inserting objects from the generator by batches, so they are not kept in memory all together.
+
+    Signals are not sent, denormalized data must be rebuilt after it.
+
+    :param model: Model class.
+    :param objects: Iterator of unsaved objects.
+    :param batch_size: Number of objects inserted by one query.
+    :return: Number of inserted objects.
+    """
+    inserted = 0
+    while batch := list(islice(objects, batch_size)):
+        with transaction.atomic():
+            model.objects.bulk_create(batch)
+        inserted += len(batch)
+    return inserted
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    """
+    Function for getting text of random words.
+    """
+    return ' '.join(rng.choices(WORDS, k=words))
+
+
+def is_generated() -> bool:
+    """
+    Checked if dataset is already in the database, names of generated rows are unique.
+    """
+    return Category.objects.filter(name__startswith=DATASET_PREFIX).exists()
+
+
+def generate_categories(rng: random.Random, count: int):
+    """
+    Generator of categories, their positions follow the existing ones.
+    """
+    start = (Category.objects.order_by('-position').values_list('position', flat=True).first() or 0) + 1
+    if start + count > 32767:
+        raise ValueError('Too many categories for SmallIntegerField position')
+    for number in range(count):
+        yield Category(name=f'{DATASET_PREFIX} category {number}', position=start + number,
+                       is_visible=rng.random() < 0.9)
+
+
+def generate_dishes(rng: random.Random, count: int, category_ids: list):
+    """
+    Generator of dishes spread over the generated categories.
+    """
+    for number in range(count):
+        name = f'{DATASET_PREFIX} {sentence(rng, 2)} {number}'
+        yield Dishes(
+            name=name, slug=slugify(name), position=rng.randint(1, 100),
+            price=Decimal(rng.randint(300, 9000)) / 100, description=sentence(rng, 12),
+            ingredients=sentence(rng, 6), is_visible=rng.random() < 0.95, special=rng.random() < 0.01,
+            category_id=category_ids[number % len(category_ids)],
+        )
+
+
+def reservation_days(count: int) -> int:
+    """
+    Function for getting number of days, so slots are filled close to the default capacity.
+    """
+    return max(1, count // (len(schedule()) * RESERVATIONS_PER_SLOT))
+
+
+def generate_reservations(rng: random.Random, count: int, start_date: datetime.date):
+    """
+    Generator of reservations, three quarters of days are in the past and processed.
+
+    Reservation is waitlisted when its slot is full, the same way as reserve() does it, so occupancy
+    index built from the rows stays within the capacity.
+    """
+    slots = schedule()
+    days = reservation_days(count)
+    first_day = start_date - datetime.timedelta(days=days * 3 // 4)
+    capacities = dict(SlotCapacity.objects.values_list('time_slot', 'seats'))
+    taken = {(row[0], row[1]): row[2] for row in SlotOccupancy.objects.values_list(
+        'date_reservation', 'time_slot', 'seats_taken')}
+    for number in range(count):
+        date = first_day + datetime.timedelta(days=rng.randrange(days))
+        time_slot = rng.choice(slots)
+        time = (datetime.datetime.combine(date, time_slot) + datetime.timedelta(
+            minutes=rng.randrange(settings.RESERVATION_SLOT_MINUTES))).time()
+        persons = rng.randint(1, 8)
+        seats = taken.get((date, time_slot), 0)
+        waitlisted = seats + persons > capacities.get(time_slot, settings.RESERVATION_DEFAULT_SEATS)
+        if not waitlisted:
+            taken[date, time_slot] = seats + persons
+        yield UserReservation(
+            name=rng.choice(NAMES), email=f'guest{number}@{DATASET_EMAIL_DOMAIN}',
+            phone=f'050 {rng.randint(100, 999)} {rng.randint(1000, 9999)}', date_reservation=date,
+            time_reservation=time, persons=persons, message=sentence(rng, 8),
+            is_processed=date < start_date, is_waitlisted=waitlisted,
+        )
+
+
+def generate_contacts(rng: random.Random, count: int):
+    """
+    Generator of contact applications, most of them are processed.
+    """
+    for number in range(count):
+        yield ContactUs(
+            name=rng.choice(NAMES), email=f'contact{number}@{DATASET_EMAIL_DOMAIN}', subject=sentence(rng, 4),
+            message=sentence(rng, 20), is_processed=rng.random() < 0.9,
+        )
+
+
+def placeholder_images() -> list:
+    """
+    Function for saving plain-colored placeholder photos with their responsive derivatives.
+
+    Generated gallery rows share these files, so thousands of rows need only PLACEHOLDER_COUNT images.
+
+    :return: List of names in the storage.
+    """
+    names = []
+    for number in range(PLACEHOLDER_COUNT):
+        name = f'{PLACEHOLDER_DIR}/placeholder-{number}.jpg'
+        if not default_storage.exists(name):
+            color_rng = random.Random(number)
+            color = tuple(color_rng.randint(40, 220) for _ in range(3))
+            buffer = BytesIO()
+            Image.new('RGB', PLACEHOLDER_SIZE, color).save(buffer, 'JPEG', quality=80)
+            name = default_storage.save(name, ContentFile(buffer.getvalue()))
+        generate_derivatives(name)
+        names.append(name)
+    return names
+
+
+def generate_photos(rng: random.Random, count: int, names: list):
+    """
+    Generator of gallery photos with placeholder images.
+    """
+    for number in range(count):
+        yield PhotoToGallery(photo=names[number % len(names)], is_visible=rng.random() < 0.95)
+
+
+def generate_dataset(scale: dict, seed: int = 0, start_date=None, batch_size: int = 5000, log=None) -> dict:
+    """
+    Function for writing generated content, reservations and contact applications to the database.
+
+    The same seed, scale and start date give the same rows (except creation time of requests).
+
+    :param scale: Number of rows of every model, see SCALES.
+    :param seed: Seed of the random generator.
+    :param start_date: Date dividing past and future reservations, today by default.
+    :param batch_size: Number of rows inserted by one query.
+    :param log: Function for progress messages.
+    :return: Dictionary with model names and number of inserted rows.
+    """
+    rng = random.Random(seed)
+    start_date = start_date or timezone.localdate()
+    log = log or (lambda message: None)
+    inserted = {}
+
+    inserted['categories'] = bulk_insert(Category, generate_categories(rng, scale['categories']), batch_size)
+    category_ids = list(Category.objects.filter(name__startswith=DATASET_PREFIX).order_by('position')
+                        .values_list('pk', flat=True))
+    log(f"{inserted['categories']} categories")
+    inserted['dishes'] = bulk_insert(Dishes, generate_dishes(rng, scale['dishes'], category_ids), batch_size)
+    log(f"{inserted['dishes']} dishes")
+    inserted['reservations'] = bulk_insert(
+        UserReservation, generate_reservations(rng, scale['reservations'], start_date), batch_size,
+    )
+    log(f"{inserted['reservations']} reservations")
+    inserted['contacts'] = bulk_insert(ContactUs, generate_contacts(rng, scale['contacts']), batch_size)
+    log(f"{inserted['contacts']} contact applications")
+    if scale['photos']:
+        names = placeholder_images()
+        inserted['photos'] = bulk_insert(PhotoToGallery, generate_photos(rng, scale['photos'], names), batch_size)
+    else:
+        inserted['photos'] = 0
+    log(f"{inserted['photos']} gallery photos")
+    return inserted
+
+
+def refresh_derived_data() -> None:
+    """
+    Function for updating data that is kept up to date by signals, bulk_create does not send them.
+
+    Occupancy index is built again, menu projection and cached pages of the content models are dropped.
+    """
+    rebuild_occupancy()
+    for model in (Category, Dishes, PhotoToGallery):
+        bump_content_version(model)
+    bump_menu_version()
+    prerender.content_changed()
@@ -1,5 +1,6 @@
 from django import forms
 from .models import UserReservation, ContactUs
+from .slots import is_open, reserve
 
 
 class ContactUsForm(forms.ModelForm):
@@ -104,9 +105,10 @@ class UserReservationForm(forms.ModelForm):
         })
     )
 
-    date_reservation = forms.CharField(
+    date_reservation = forms.DateField(
+        input_formats=['%Y-%m-%d', '%d.%m.%Y', '%d/%m/%Y'],
         widget=forms.DateInput(attrs={
-            'type': 'text',
+            'type': 'date',
             'name': 'date',
             'class': 'form-control',
             'id': 'date',
@@ -116,9 +118,10 @@ class UserReservationForm(forms.ModelForm):
         })
     )
 
-    time_reservation = forms.CharField(
+    time_reservation = forms.TimeField(
+        input_formats=['%H:%M', '%H:%M:%S'],
         widget=forms.TimeInput(attrs={
-            'type': 'text',
+            'type': 'time',
             'name': 'time',
             'class': 'form-control',
             'id': 'time',
@@ -128,8 +131,8 @@ class UserReservationForm(forms.ModelForm):
         })
     )
 
-    persons = forms.CharField(
-        max_length=15,
+    persons = forms.IntegerField(
+        min_value=1,
         widget=forms.NumberInput(attrs={
             'type': 'number',
             'name': 'people',
@@ -155,3 +158,22 @@ class UserReservationForm(forms.ModelForm):
     class Meta:
         model = UserReservation
         fields = ('name', 'email', 'phone', 'date_reservation', 'time_reservation', 'persons', 'message')
+
+    def clean_time_reservation(self):
+        """
+        Checked that reservation time is inside opening hours.
+        """
+        time_reservation = self.cleaned_data['time_reservation']
+        if not is_open(time_reservation):
+            raise forms.ValidationError('We are closed at this time.')
+        return time_reservation
+
+    def save(self, commit=True):
+        """
+        Saved reservation only if it fits into the time slot, see main_page/slots.py.
+
+        :raise SlotIsFull: Slot is full and waitlist is turned off.
+        """
+        if not commit:
+            return super().save(commit=False)
+        return reserve(self.instance)
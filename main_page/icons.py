@@ -0,0 +1,147 @@
+import os
+import posixpath
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+
+from .assets import minify_css, read_static, split_rules
+
+try:
+    from fontTools import subset
+except ImportError:
+    subset = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ICON_CLASS_RE = re.compile(r'(?<![\w-])((?:bi|bxs|bxl|bx)-[a-z0-9]+(?:-[a-z0-9]+)*)')
+ICON_RULE_RE = re.compile(r'^\.((?:bi|bxs|bxl|bx)-[\w-]+)::?before$')
+ICON_CONTENT_RE = re.compile(r'content:\s*"\\([0-9a-fA-F]+)"')
+SCANNED_EXTENSIONS = ('.html', '.js')
+
+
+def used_icon_classes() -> set:
+    """
+    Function for finding icon classes in the templates and scripts from ICON_SCAN_DIRS.
+
+    Classes that are not written in files (for example in HTML fields of the models) are taken
+    from ICON_EXTRA_CLASSES.
+
+    :return: Set of classes, for example {'bi-list', 'bxl-twitter'}.
+    """
+    classes = set(settings.ICON_EXTRA_CLASSES)
+    for directory in settings.ICON_SCAN_DIRS:
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if name.endswith(SCANNED_EXTENSIONS):
+                    with open(os.path.join(root, name), encoding='utf-8') as file:
+                        classes.update(ICON_CLASS_RE.findall(file.read()))
+    return classes
+
+
+def font_face(family: str, formats) -> str:
+    """
+    Function for getting @font-face rule of the subset font.
+
+    :param family: Font family.
+    :param formats: Tuples (file name, format) of the subset font files.
+    :return: CSS rule.
+    """
+    sources = ','.join(f'url("./{name}") format("{font_format}")' for name, font_format in formats)
+    return (f'@font-face{{font-display:block;font-family:"{family}";font-style:normal;font-weight:400;'
+            f'src:{sources}}}')
+
+
+def trim_css(css: str, classes: set) -> tuple:
+    """
+    Function for removing rules of the unused icons from the icon font stylesheet.
+
+    Other rules (base class, animations) are kept, @font-face rules are removed, new one is added by
+    build_icon_subsets().
+
+    :param css: Minified stylesheet of the icon font.
+    :param classes: Used icon classes.
+    :return: Tuple (font family, trimmed rules, codepoints of the used icons).
+    """
+    family = None
+    rules = []
+    codepoints = set()
+    for prelude, body in split_rules(css):
+        if body is None:
+            continue
+        if prelude.startswith('@font-face'):
+            family = re.search(r'font-family:\s*["\']?([^"\';]+)', body).group(1)
+            continue
+        selectors = [ICON_RULE_RE.match(selector.strip()) for selector in prelude.split(',')]
+        content = ICON_CONTENT_RE.search(body)
+        if content and all(selectors):
+            used = [match.group(0) for match in selectors if match.group(1) in classes]
+            if not used:
+                continue
+            codepoints.add(int(content.group(1), 16))
+            prelude = ','.join(used)
+        rules.append(f'{prelude}{{{body}}}')
+    return family, ''.join(rules), codepoints
+
+
+def subset_font(source: str, codepoints: set, target: str, flavor: str) -> None:
+    """
+    Function for writing font with only the given glyphs.
+
+    :param source: Full path of the original font.
+    :param codepoints: Codepoints of the used icons.
+    :param target: Full path of the subset font.
+    :param flavor: woff or woff2.
+    """
+    options = subset.Options()
+    options.flavor = flavor
+    options.layout_features = ['*']
+    options.notdef_outline = True
+    font = subset.load_font(source, options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    subset.save_font(font, target, options)
+
+
+def subset_css_path(name: str) -> str:
+    """
+    Function for getting static path of the trimmed stylesheet of the icon font.
+
+    :param name: Name of the font from ICON_FONTS.
+    :return: Path relative to the static directory, for example 'assets/icons/bootstrap-icons.css'.
+    """
+    return posixpath.join(settings.ICON_SUBSET_DIR, f'{name}.css')
+
+
+def build_icon_subsets() -> list:
+    """
+    Function for building subset fonts and trimmed stylesheets of ICON_FONTS in ICON_BUILD_ROOT.
+
+    WOFF2 files are written only when brotli is installed, WOFF files are written always.
+
+    :return: List of tuples (full path of the written file, size in bytes).
+    """
+    if subset is None:
+        raise ImportError('fontTools is required for icon subsetting: pip install fonttools')
+    classes = used_icon_classes()
+    flavors = ('woff2', 'woff') if brotli is not None else ('woff', )
+    os.makedirs(settings.ICON_BUILD_ROOT, exist_ok=True)
+    written = []
+    for name, (css_path, font_path) in settings.ICON_FONTS.items():
+        family, rules, codepoints = trim_css(minify_css(read_static(css_path)), classes)
+        formats = []
+        for flavor in flavors:
+            font_name = f'{name}.{flavor}'
+            target = os.path.join(settings.ICON_BUILD_ROOT, font_name)
+            subset_font(finders.find(font_path), codepoints, target, flavor)
+            formats.append((font_name, flavor))
+            written.append(target)
+        css_target = os.path.join(settings.ICON_BUILD_ROOT, posixpath.basename(subset_css_path(name)))
+        with open(css_target, 'w', encoding='utf-8') as file:
+            file.write(font_face(family, formats) + rules)
+        written.append(css_target)
+    return [(path, os.path.getsize(path)) for path in written]
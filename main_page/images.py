@@ -0,0 +1,130 @@
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import models
+from PIL import Image, ImageOps
+
+# Extensions and Pillow formats of the derivatives.
+DERIVATIVE_FORMATS = (('webp', 'WEBP'), ('jpg', 'JPEG'))
+DERIVATIVE_WIDTHS_KEY = 'image_widths:{}'
+
+
+def derivative_name(name: str, width: int, ext: str) -> str:
+    """
+    Function for getting name of the image derivative, it is stored next to the original.
+
+    :param name: Name of the original file in the storage.
+    :param width: Width of the derivative.
+    :param ext: Extension of the derivative.
+    :return: Name of the derivative in the storage.
+    """
+    return f'{os.path.splitext(name)[0]}-{width}w.{ext}'
+
+
+def probe_widths(name: str) -> list:
+    """
+    Function for getting widths of the existing derivatives of the image from the storage.
+
+    Derivatives are created from the smallest width without gaps, so search stops at the first missing one.
+
+    :param name: Name of the original file in the storage.
+    :return: List of widths in ascending order.
+    """
+    widths = []
+    for width in settings.IMAGE_DERIVATIVE_WIDTHS:
+        if not default_storage.exists(derivative_name(name, width, 'jpg')):
+            break
+        widths.append(width)
+    return widths
+
+
+def derivative_widths(name: str) -> list:
+    """
+    Function for getting widths of the existing derivatives of the image.
+
+    Widths are saved to the cache when derivatives are created, so pages are rendered without storage
+    requests. Storage is checked only for images missing in the cache (created before, cache cleared).
+
+    :param name: Name of the original file in the storage.
+    :return: List of widths in ascending order.
+    """
+    key = DERIVATIVE_WIDTHS_KEY.format(name)
+    widths = cache.get(key)
+    if widths is None:
+        widths = probe_widths(name)
+        # Widths saved by generate_derivatives() at the same time are not replaced, image without
+        # derivatives is checked again later.
+        cache.add(key, widths, timeout=None if widths else settings.MAIN_PAGE_CACHE_TIMEOUT)
+    return widths
+
+
+def generate_derivatives(name: str) -> int:
+    """
+    Function for creating width-bucketed WebP and JPEG copies of the image.
+
+    Copies are created only for widths smaller than the original (the smallest one is always created).
+    File names are unique and never change content, so image with the smallest copies is skipped.
+    Widths of the copies are saved to the cache for derivative_widths().
+
+    :param name: Name of the original file in the storage.
+    :return: Number of created files.
+    """
+    smallest = settings.IMAGE_DERIVATIVE_WIDTHS[0]
+    if all(default_storage.exists(derivative_name(name, smallest, ext)) for ext, _ in DERIVATIVE_FORMATS):
+        # Images processed before the widths were cached.
+        derivative_widths(name)
+        return 0
+
+    with default_storage.open(name) as file:
+        original = ImageOps.exif_transpose(Image.open(file))
+        original.load()
+
+    has_alpha = 'A' in original.getbands() or 'transparency' in original.info
+    created = 0
+    widths = []
+    for index, width in enumerate(settings.IMAGE_DERIVATIVE_WIDTHS):
+        if index and width >= original.width:
+            break
+        widths.append(width)
+        image = original.copy()
+        image.thumbnail((width, original.height), Image.Resampling.LANCZOS)
+        for ext, image_format in DERIVATIVE_FORMATS:
+            new_name = derivative_name(name, width, ext)
+            if default_storage.exists(new_name):
+                continue
+            converted = image.convert('RGBA' if has_alpha and image_format == 'WEBP' else 'RGB')
+            buffer = BytesIO()
+            converted.save(buffer, image_format, quality=settings.IMAGE_DERIVATIVE_QUALITY, optimize=True)
+            default_storage.save(new_name, ContentFile(buffer.getvalue()))
+            created += 1
+    cache.set(DERIVATIVE_WIDTHS_KEY.format(name), widths, timeout=None)
+    return created
+
+
+def image_field_names(model) -> list:
+    """
+    Function for getting names of the image fields of the model.
+
+    :param model: Model class.
+    :return: List of field names.
+    """
+    return [field.name for field in model._meta.get_fields() if isinstance(field, models.ImageField)]
+
+
+def generate_instance_derivatives(instance) -> int:
+    """
+    Function for creating derivatives of all images of the object.
+
+    :param instance: Model object.
+    :return: Number of created files.
+    """
+    created = 0
+    for field_name in image_field_names(type(instance)):
+        field_file = getattr(instance, field_name)
+        if field_file and default_storage.exists(field_file.name):
+            created += generate_derivatives(field_file.name)
+    return created
@@ -0,0 +1,103 @@
+import json
+import os
+import tempfile
+
+import django
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, \
+    teardown_test_environment
+
+from main_page.benchmark import SCENARIOS, compare_with_baseline, run_scenario
+
+
+class Command(BaseCommand):
+    """
+    Command for measuring latency, throughput and queries per request of the public and manager pages.
+
+    Pages are requested in-process from concurrent clients against a throwaway test database
+    with db.json fixture, so runs on the same machine are comparable.
+
+    Usage: DEVELOPMENT_MODE=True python manage.py benchmark --output baseline.json
+           DEVELOPMENT_MODE=True python manage.py benchmark --baseline baseline.json
+    """
+    help = 'Benchmark the main, login, registration and manager pages and reservation POSTs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenario', action='append', choices=list(SCENARIOS),
+                            help='Scenario to run, all scenarios by default. Can be repeated.')
+        parser.add_argument('--requests', type=int, default=200, help='Measured requests per scenario.')
+        parser.add_argument('--concurrency', type=int, default=4, help='Number of concurrent clients.')
+        parser.add_argument('--warmup', type=int, default=20, help='Requests before the measurement.')
+        parser.add_argument('--fixture', default=os.path.join(settings.BASE_DIR, 'db.json'),
+                            help='Fixture loaded to the test database.')
+        parser.add_argument('--output', help='Write JSON report to the file, - for stdout.')
+        parser.add_argument('--baseline', help='JSON report to compare with.')
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help='Allowed change of p95 and rps against the baseline, 0.2 - 20%%.')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError('--requests and --concurrency must be positive.')
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline'], encoding='utf-8') as file:
+                baseline = json.load(file)['results']
+
+        results = self.run(options)
+        report = {
+            'meta': {
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+            },
+            'results': results,
+        }
+        for name, metrics in results.items():
+            self.stderr.write(f"{name:<22} {metrics['rps']:>8} rps  p50 {metrics['p50_ms']:>7} ms  "
+                              f"p95 {metrics['p95_ms']:>7} ms  p99 {metrics['p99_ms']:>7} ms  "
+                              f"{metrics['queries']:>5} queries  {metrics['errors']} errors")
+        if options['output'] == '-':
+            self.stdout.write(json.dumps(report, indent=2))
+        elif options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(report, file, indent=2)
+
+        if baseline is not None:
+            regressions = compare_with_baseline(results, baseline, options['threshold'])
+            if regressions:
+                raise CommandError('Regressions against the baseline:\n' + '\n'.join(regressions))
+            self.stderr.write('No regressions against the baseline.')
+
+    def run(self, options) -> dict:
+        """
+        Function for running the scenarios on the test database.
+
+        SQLite test database is created in a temporary file instead of memory, so concurrent clients
+        work with it the same way as with the real one. Writing scenarios are run by one client on SQLite.
+
+        :param options: Options of the command.
+        :return: Dictionary with scenario names and metrics.
+        """
+        setup_test_environment()
+        temp_dir = tempfile.TemporaryDirectory()
+        if connection.vendor == 'sqlite':
+            connection.settings_dict['TEST']['NAME'] = os.path.join(temp_dir.name, 'benchmark.sqlite3')
+        databases = setup_databases(verbosity=0, interactive=False, aliases={'default'})
+        try:
+            call_command('loaddata', options['fixture'], verbosity=0)
+            results = {}
+            for name in options['scenario'] or SCENARIOS:
+                concurrency = options['concurrency']
+                if SCENARIOS[name]['writes'] and connection.vendor == 'sqlite':
+                    # SQLite fails concurrent write transactions with "database is locked" instead of waiting.
+                    concurrency = 1
+                results[name] = run_scenario(name, options['requests'], concurrency, options['warmup'])
+            return results
+        finally:
+            teardown_databases(databases, verbosity=0)
+            teardown_test_environment()
+            temp_dir.cleanup()
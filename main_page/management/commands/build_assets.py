@@ -0,0 +1,18 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from main_page.assets import build_bundles
+
+
+class Command(BaseCommand):
+    """
+    Command for building CSS and JS bundles of the base templates and critical CSS of the main page.
+
+    Usage: python manage.py build_assets && python manage.py collectstatic
+    """
+    help = 'Concatenate and minify ASSET_BUNDLES and extract critical CSS, run it before collectstatic.'
+
+    def handle(self, *args, **options):
+        for path in build_bundles():
+            self.stdout.write(f'{path}: {os.path.getsize(path) // 1024}K')
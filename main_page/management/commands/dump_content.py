@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from main_page.transfer import dump_lines, open_dump
+
+
+class Command(BaseCommand):
+    """
+    Command for streaming groups, users and main_page models to JSON Lines file.
+
+    Usage: python manage.py dump_content content.jsonl.gz
+    """
+    help = 'Dump groups, users and site content to JSON Lines (.gz is compressed, - is stdout).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Path of the dump file.')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Rows fetched from the database at once.')
+
+    def handle(self, *args, **options):
+        with open_dump(options['path'], 'w') as file:
+            file.writelines(dump_lines(options['chunk_size'], self.stderr.write))
@@ -0,0 +1,40 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main_page.dataset import SCALES, generate_dataset, is_generated, refresh_derived_data
+
+
+class Command(BaseCommand):
+    """
+    Command for filling the database with deterministic generated content, reservations and contact applications.
+
+    Usage: python manage.py generate_dataset --scale large [--reservations 200000] [--seed 1]
+
+    Use it on a development or benchmark database, rows are inserted without signals and the derived data
+    (slot occupancy, menu projection, cached pages) is rebuilt at the end.
+    """
+    help = 'Generate categories, dishes, reservations, contact applications and gallery photos with bulk_create.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=list(SCALES), default='small', help='Preset of row numbers.')
+        for name in SCALES['small']:
+            parser.add_argument(f'--{name}', type=int, help=f'Number of {name}, overrides the scale.')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the random generator.')
+        parser.add_argument('--start-date', type=datetime.date.fromisoformat,
+                            help='Date in format YYYY-MM-DD dividing past and future reservations, today by default.')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows inserted by one query.')
+
+    def handle(self, *args, **options):
+        if is_generated():
+            raise CommandError('Dataset is already generated, flush the database first.')
+        scale = {name: count if options[name] is None else options[name] for name, count in
+                 SCALES[options['scale']].items()}
+        if scale['dishes'] and not scale['categories']:
+            raise CommandError('Dishes need at least one category.')
+        try:
+            generate_dataset(scale, options['seed'], options['start_date'], options['batch_size'], self.stdout.write)
+        except ValueError as error:
+            raise CommandError(str(error))
+        refresh_derived_data()
+        self.stdout.write('Slot occupancy, menu projection and cached pages are rebuilt.')
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from main_page.cache import bump_content_version
+from main_page.images import image_field_names, generate_instance_derivatives
+from main_page.models import CONTENT_MODELS
+
+
+class Command(BaseCommand):
+    """
+    Command for creating responsive derivatives of the images uploaded before the pipeline was added.
+
+    Usage: python manage.py generate_image_derivatives
+    """
+    help = 'Create width-bucketed WebP and JPEG copies of all uploaded images.'
+
+    def handle(self, *args, **options):
+        for model in CONTENT_MODELS:
+            if not image_field_names(model):
+                continue
+            created = 0
+            for instance in model.objects.iterator():
+                created += generate_instance_derivatives(instance)
+            if created:
+                # Cached pages and sections still refer to the original files.
+                bump_content_version(model)
+            self.stdout.write(f'{model._meta.label}: {created} files created.')
@@ -0,0 +1,31 @@
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from main_page.dataset import refresh_derived_data
+from main_page.transfer import load_lines, open_dump
+
+
+class Command(BaseCommand):
+    """
+    Command for loading dump of dump_content with bulk_create batches in one transaction.
+
+    Rows with existing primary keys are updated. Signals are not sent, slot occupancy, menu projection
+    and cached pages are rebuilt at the end.
+
+    Usage: python manage.py load_content content.jsonl.gz
+    """
+    help = 'Load JSON Lines dump of dump_content (.gz is compressed, - is stdin).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Path of the dump file.')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows inserted by one query.')
+
+    def handle(self, *args, **options):
+        try:
+            with open_dump(options['path'], 'r') as file:
+                loaded = load_lines(file, options['batch_size'], self.stderr.write)
+        except (ValueError, ObjectDoesNotExist, IntegrityError) as error:
+            raise CommandError(str(error))
+        refresh_derived_data()
+        self.stdout.write(f'{sum(loaded.values())} rows loaded.')
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from main_page.prerender import build_static_page, delete_static_page, page_expired, page_path
+
+
+class Command(BaseCommand):
+    """
+    Command for rendering the main page for anonymous visitors to static HTML with gzip and Brotli variants.
+
+    Usage: python manage.py prerender_main_page [--delete] [--expired]
+
+    The page shows upcoming events only, run the command with --expired from cron (every minute),
+    so the page is rebuilt when the nearest event starts.
+    """
+    help = 'Render the main page to PRERENDER_ROOT, it is served to anonymous visitors when PRERENDER_PAGE is on.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--delete', action='store_true', help='Delete the pre-rendered page.')
+        parser.add_argument('--expired', action='store_true',
+                            help='Render the page only if it is missing or the nearest event has started.')
+
+    def handle(self, *args, **options):
+        if options['delete']:
+            delete_static_page()
+            self.stdout.write(f'{page_path()} deleted.')
+            return
+        if options['expired'] and not page_expired():
+            self.stdout.write(f'{page_path()} is up to date.')
+            return
+        build_static_page()
+        self.stdout.write(f'{page_path()} created.')
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from main_page.icons import build_icon_subsets, used_icon_classes
+
+
+class Command(BaseCommand):
+    """
+    Command for building icon fonts with only the icons used in the templates and scripts.
+
+    Usage: python manage.py subset_icons && python manage.py build_assets && python manage.py collectstatic
+    """
+    help = 'Subset bootstrap-icons and boxicons fonts to the icons used in ICON_SCAN_DIRS (requires fonttools).'
+
+    def handle(self, *args, **options):
+        try:
+            written = build_icon_subsets()
+        except ImportError as error:
+            raise CommandError(str(error))
+        self.stdout.write(f'{len(used_icon_classes())} icon classes used.')
+        for path, size in written:
+            self.stdout.write(f'{path}: {size // 1024}K')
@@ -0,0 +1,87 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Category, Dishes
+
+MENU_VERSION_KEY = 'menu_version'
+MENU_KEY = 'menu_projection:{}'
+
+
+# Fields of the rows used in menu and specials sections.
+CATEGORY_FIELDS = ('pk', 'name', 'position')
+DISH_FIELDS = ('pk', 'name', 'slug', 'position', 'price', 'description', 'ingredients', 'special', 'photo',
+               'category_id')
+
+
+def build_menu() -> dict:
+    """
+    Function for building menu projection from the database with two queries.
+
+    :return: Menu projection.
+    """
+    categories = list(Category.objects.filter(is_visible=True).order_by('position').values(*CATEGORY_FIELDS))
+    dishes = list(Dishes.objects.filter(is_visible=True, category__is_visible=True)
+                  .order_by('position', 'price').values(*DISH_FIELDS))
+    return {
+        'categories': categories,
+        'dishes': dishes,
+        'specials': [row for row in dishes if row['special']],
+    }
+
+
+def menu_version() -> str:
+    """
+    Function for getting version of the menu projection, it is changed after every committed change
+    of categories and dishes.
+
+    :return: Version string.
+    """
+    return cache.get(MENU_VERSION_KEY) or '0'
+
+
+def bump_menu_version() -> None:
+    """
+    Function for marking menu projection as changed, it is built again by the next get_menu().
+    """
+    cache.set(MENU_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def menu_changed() -> None:
+    """
+    Function for changing menu version after the current transaction is committed.
+
+    Projection built by another worker before the commit is saved under the previous version,
+    so it is never read again, and a rolled back change does not touch the cache.
+    """
+    transaction.on_commit(bump_menu_version)
+
+
+def save_menu(menu: dict, version: str) -> None:
+    """
+    Function for saving menu projection to the cache.
+
+    :param menu: Menu projection.
+    :param version: Menu version read before the projection was built.
+    """
+    cache.set(MENU_KEY.format(version), menu, timeout=settings.MAIN_PAGE_CACHE_TIMEOUT)
+
+
+def get_menu() -> dict:
+    """
+    Function for getting menu projection, it is built only if it is missing in the cache.
+
+    categories - Rows of the visible categories ordered by position.\n
+    dishes - Rows of the visible dishes from visible categories ordered by position and price.\n
+    specials - Rows of the dishes marked as special.\n
+
+    :return: Menu projection.
+    """
+    version = menu_version()
+    menu = cache.get(MENU_KEY.format(version))
+    if menu is None:
+        menu = build_menu()
+        save_menu(menu, version)
+    return menu
@@ -0,0 +1,111 @@
+# Generated by Django 4.1.5 on 2026-10-18 12:00
+
+import datetime
+
+from django.db import migrations, models
+
+DATE_FORMATS = ('%d.%m.%Y', '%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y')
+TIME_FORMATS = ('%H:%M:%S', '%H:%M')
+
+
+def parse(value, formats):
+    """
+    Function for parsing string with one of the formats.
+
+    :param value: String from the old column.
+    :param formats: Formats for datetime.strptime.
+    :return: datetime object or None.
+    """
+    for value_format in formats:
+        try:
+            return datetime.datetime.strptime(value.strip(), value_format)
+        except ValueError:
+            continue
+    return None
+
+
+def strings_to_date_and_time(apps, schema_editor):
+    """
+    Copy string date and time of reservations to the typed columns.
+
+    Unparseable date is replaced by the date of the request, unparseable time by midnight.
+    """
+    UserReservation = apps.get_model('main_page', 'UserReservation')
+    for reservation in UserReservation.objects.iterator():
+        date = parse(reservation.date_reservation, DATE_FORMATS)
+        time = parse(reservation.time_reservation, TIME_FORMATS)
+        reservation.date_reservation_typed = date.date() if date else reservation.date_of_the_request.date()
+        reservation.time_reservation_typed = time.time() if time else datetime.time()
+        reservation.save(update_fields=['date_reservation_typed', 'time_reservation_typed'])
+
+
+def date_and_time_to_strings(apps, schema_editor):
+    UserReservation = apps.get_model('main_page', 'UserReservation')
+    for reservation in UserReservation.objects.iterator():
+        reservation.date_reservation = reservation.date_reservation_typed.strftime('%d.%m.%Y')
+        reservation.time_reservation = reservation.time_reservation_typed.strftime('%H:%M:%S')
+        reservation.save(update_fields=['date_reservation', 'time_reservation'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_page', '0013_alter_informationincontactus_open_hours_for_top_bar'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userreservation',
+            name='date_reservation_typed',
+            field=models.DateField(null=True),
+        ),
+        migrations.AddField(
+            model_name='userreservation',
+            name='time_reservation_typed',
+            field=models.TimeField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='userreservation',
+            name='date_reservation',
+            field=models.CharField(max_length=10, null=True),
+        ),
+        migrations.AlterField(
+            model_name='userreservation',
+            name='time_reservation',
+            field=models.CharField(max_length=10, null=True),
+        ),
+        migrations.RunPython(strings_to_date_and_time, date_and_time_to_strings),
+        migrations.RemoveField(
+            model_name='userreservation',
+            name='date_reservation',
+        ),
+        migrations.RemoveField(
+            model_name='userreservation',
+            name='time_reservation',
+        ),
+        migrations.RenameField(
+            model_name='userreservation',
+            old_name='date_reservation_typed',
+            new_name='date_reservation',
+        ),
+        migrations.RenameField(
+            model_name='userreservation',
+            old_name='time_reservation_typed',
+            new_name='time_reservation',
+        ),
+        migrations.AlterField(
+            model_name='userreservation',
+            name='date_reservation',
+            field=models.DateField(),
+        ),
+        migrations.AlterField(
+            model_name='userreservation',
+            name='time_reservation',
+            field=models.TimeField(),
+        ),
+        migrations.AddIndex(
+            model_name='userreservation',
+            index=models.Index(fields=['date_reservation', 'time_reservation', 'is_processed'],
+                               name='reservation_slot_idx'),
+        ),
+    ]
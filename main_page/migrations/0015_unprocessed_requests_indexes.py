@@ -0,0 +1,21 @@
+# Generated by Django 4.1.5 on 2026-10-18 13:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_page', '0014_userreservation_typed_date_and_time'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contactus',
+            index=models.Index(condition=models.Q(('is_processed', False)), fields=['-date_of_the_request', '-id'], name='contact_unprocessed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userreservation',
+            index=models.Index(condition=models.Q(('is_processed', False)), fields=['-date_of_the_request', '-id'], name='reservation_unprocessed_idx'),
+        ),
+    ]
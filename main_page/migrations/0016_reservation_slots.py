@@ -0,0 +1,70 @@
+# Generated by Django 4.1.5 on 2026-10-18 13:52
+
+import datetime
+from collections import Counter
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def build_occupancy(apps, schema_editor):
+    """
+    Function for building the slot occupancy index from existing reservations.
+    """
+    UserReservation = apps.get_model('main_page', 'UserReservation')
+    SlotOccupancy = apps.get_model('main_page', 'SlotOccupancy')
+    slot_minutes = getattr(settings, 'RESERVATION_SLOT_MINUTES', 30)
+    taken = Counter()
+    rows = UserReservation.objects.values_list('date_reservation', 'time_reservation', 'persons')
+    for date_reservation, time_reservation, persons in rows.iterator():
+        start = time_reservation.hour * 60 + time_reservation.minute
+        start -= start % slot_minutes
+        taken[date_reservation, datetime.time(start // 60, start % 60)] += persons
+    SlotOccupancy.objects.bulk_create(
+        SlotOccupancy(date_reservation=date_reservation, time_slot=time_slot, seats_taken=seats_taken)
+        for (date_reservation, time_slot), seats_taken in taken.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_page', '0015_unprocessed_requests_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlotCapacity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('time_slot', models.TimeField(unique=True)),
+                ('seats', models.PositiveSmallIntegerField()),
+            ],
+            options={
+                'verbose_name_plural': 'slot capacities',
+                'ordering': ('time_slot',),
+            },
+        ),
+        migrations.CreateModel(
+            name='SlotOccupancy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date_reservation', models.DateField()),
+                ('time_slot', models.TimeField()),
+                ('seats_taken', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'slot occupancies',
+            },
+        ),
+        migrations.AddField(
+            model_name='userreservation',
+            name='is_waitlisted',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddConstraint(
+            model_name='slotoccupancy',
+            constraint=models.UniqueConstraint(fields=('date_reservation', 'time_slot'), name='unique_occupancy_slot'),
+        ),
+        migrations.RunPython(build_occupancy, migrations.RunPython.noop),
+    ]
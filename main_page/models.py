@@ -290,6 +290,7 @@ class UserReservation(models.Model):
     message - Additional message.\n
     date_of_the_request - Date and time when request was created.\n
     is_processed - Is request processed oe not.\n
+    is_waitlisted - Is request put to the waitlist because time slot was full.\n
     """
 
     mobile_re = RegexValidator(regex=r'^(\d{3}[- .]?){2}\d{4}$', message='Phone in format xxx xxx xxxx')
@@ -299,20 +300,71 @@ class UserReservation(models.Model):
     name = models.CharField(max_length=50)
     email = models.CharField(max_length=63, validators=[email_re])
     phone = models.CharField(max_length=15, validators=[mobile_re])
-    date_reservation = models.CharField(max_length=10)
-    time_reservation = models.CharField(max_length=10)
+    date_reservation = models.DateField()
+    time_reservation = models.TimeField()
     persons = models.PositiveSmallIntegerField()
     message = models.TextField(max_length=250, blank=True)
     date_of_the_request = models.DateTimeField(auto_now_add=True)
     is_processed = models.BooleanField(default=False)
+    is_waitlisted = models.BooleanField(default=False)
 
     class Meta:
         ordering = ('-date_of_the_request', )
+        indexes = (
+            models.Index(fields=['date_reservation', 'time_reservation', 'is_processed'],
+                         name='reservation_slot_idx'),
+            models.Index(fields=['-date_of_the_request', '-id'], condition=models.Q(is_processed=False),
+                         name='reservation_unprocessed_idx'),
+        )
 
     def __str__(self):
         return f'{self.name}, {self.phone}: {self.message}'
 
 
+class SlotCapacity(models.Model):
+    """
+    The class is responsible for creating "Slot Capacity" models in the database. Capacity is the same for every
+    day, slots without it have RESERVATION_DEFAULT_SEATS seats.
+
+    time_slot - Start time of the reservation slot.\n
+    seats - How many persons can be seated in the slot.\n
+    """
+
+    time_slot = models.TimeField(unique=True)
+    seats = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ('time_slot', )
+        verbose_name_plural = 'slot capacities'
+
+    def __str__(self):
+        return f'{self.time_slot:%H:%M}: {self.seats}'
+
+
+class SlotOccupancy(models.Model):
+    """
+    The class is responsible for creating "Slot Occupancy" models in the database, index of the booked seats.
+    It is updated by signals on every reservation save and delete (main_page/slots.py).
+
+    date_reservation - Date of the slot.\n
+    time_slot - Start time of the slot.\n
+    seats_taken - How many persons are booked in the slot, waitlisted requests are not counted.\n
+    """
+
+    date_reservation = models.DateField()
+    time_slot = models.TimeField()
+    seats_taken = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = 'slot occupancies'
+        constraints = (
+            models.UniqueConstraint(fields=['date_reservation', 'time_slot'], name='unique_occupancy_slot'),
+        )
+
+    def __str__(self):
+        return f'{self.date_reservation} {self.time_slot:%H:%M}: {self.seats_taken}'
+
+
 class ThisIsForTest(models.Model):
     """
     Test feature.
@@ -349,6 +401,10 @@ class ContactUs(models.Model):
 
     class Meta:
         ordering = ('-date_of_the_request', )
+        indexes = (
+            models.Index(fields=['-date_of_the_request', '-id'], condition=models.Q(is_processed=False),
+                         name='contact_unprocessed_idx'),
+        )
 
     def __str__(self):
         return f'{self.name}, {self.email} - {self.subject}'
@@ -408,3 +464,6 @@ class Footer(models.Model):
         return f'{self.header} - {self.site_owner}'
 
 
+# Models that feed the public pages, changes in them invalidate cached content.
+CONTENT_MODELS = (Category, Dishes, Events, PhotoToGallery, AboutUs, BlockOfInformation, CrewMember,
+                  CustomerFeedback, HeroSection, ThisIsForTest, InformationInContactUs, Footer)
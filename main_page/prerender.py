@@ -0,0 +1,187 @@
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db import connections, transaction
+from django.http import HttpRequest
+from django.template.loader import render_to_string
+from whitenoise.compress import Compressor
+
+from .cache import content_versions
+from .forms import UserReservationForm, ContactUsForm
+from .views import CSRF_TOKEN_PLACEHOLDER, menu_sections, section_querysets, page_timeout
+
+PAGE_NAME = 'index.html'
+COMPRESSED_SUFFIXES = ('.gz', '.br')
+# File with the time (Unix timestamp) when the page must be rebuilt because of the nearest event.
+EXPIRES_SUFFIX = '.expires'
+
+rebuild_lock = threading.Lock()
+rebuild_timer = None
+
+
+def page_path() -> str:
+    """
+    Function for getting path of the pre-rendered main page.
+
+    :return: Path inside PRERENDER_ROOT.
+    """
+    return os.path.join(settings.PRERENDER_ROOT, PAGE_NAME)
+
+
+def render_static_page() -> tuple:
+    """
+    Function for rendering the main page as it is seen by anonymous visitor.
+
+    CSRF token is left as placeholder, it is filled by assets/js/csrf.js in the browser.
+
+    :return: Tuple (HTML in bytes, seconds until the page must be rebuilt because of the nearest event).
+    """
+    request = HttpRequest()
+    request.method = 'GET'
+    request.path = request.path_info = '/'
+    request.user = AnonymousUser()
+    context = {
+        **menu_sections(),
+        **section_querysets(),
+        'reservation_form': UserReservationForm(),
+        'contact_us': ContactUsForm(),
+        'content_versions': content_versions(),
+        'user_manager': False,
+        'user_auth': False,
+        'csrf_token': CSRF_TOKEN_PLACEHOLDER,
+    }
+    content = render_to_string('main_page.html', context, request)
+    return content.encode(), page_timeout(context['events'])
+
+
+def remove_file(path: str) -> None:
+    """
+    Function for removing file that may be already removed.
+
+    :param path: Path of the file.
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def delete_static_page() -> None:
+    """
+    Function for deleting the pre-rendered page, visitors get the dynamic page until it is built again.
+    """
+    path = page_path()
+    for suffix in ('', *COMPRESSED_SUFFIXES, EXPIRES_SUFFIX):
+        remove_file(path + suffix)
+
+
+def temp_path_of(path: str) -> str:
+    """
+    Function for getting path of the temporary file, unique for the process and the thread.
+
+    :param path: Path of the file.
+    :return: Temporary path in the same directory.
+    """
+    return f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+
+
+def replace_file(path: str, content: bytes) -> None:
+    """
+    Function for writing file atomically: content is written to a temporary file that replaces the old one.
+
+    :param path: Path of the file.
+    :param content: Content in bytes.
+    """
+    temp_path = temp_path_of(path)
+    with open(temp_path, 'wb') as file:
+        file.write(content)
+    os.replace(temp_path, path)
+
+
+def build_static_page() -> int:
+    """
+    Function for writing the pre-rendered page with gzip and Brotli (if brotli is installed) variants.
+
+    Every file is written to a temporary path and replaces the old one, so the page is never missing
+    while it is rebuilt. Time when the page expires (start of the nearest event) is saved next to it.
+
+    :return: Seconds until the page must be rebuilt.
+    """
+    content, timeout = render_static_page()
+    path = page_path()
+    os.makedirs(settings.PRERENDER_ROOT, exist_ok=True)
+    temp_path = temp_path_of(path)
+    with open(temp_path, 'wb') as file:
+        file.write(content)
+    try:
+        compressed = [name[len(temp_path):] for name in Compressor(quiet=True).compress(temp_path)]
+        for suffix in COMPRESSED_SUFFIXES:
+            if suffix in compressed:
+                os.replace(temp_path + suffix, path + suffix)
+            else:
+                remove_file(path + suffix)
+        os.replace(temp_path, path)
+    finally:
+        for suffix in ('', *COMPRESSED_SUFFIXES):
+            remove_file(temp_path + suffix)
+    replace_file(path + EXPIRES_SUFFIX, str(time.time() + timeout).encode())
+    return timeout
+
+
+def page_expired() -> bool:
+    """
+    Checked if the pre-rendered page is missing or shows an event that has already started.
+
+    :return: True or False.
+    """
+    try:
+        with open(page_path() + EXPIRES_SUFFIX) as file:
+            expires = float(file.read())
+    except (FileNotFoundError, ValueError):
+        return True
+    return time.time() >= expires or not os.path.exists(page_path())
+
+
+def rebuild_static_page() -> None:
+    """
+    Function for rebuilding the page in the timer thread.
+    """
+    try:
+        build_static_page()
+    finally:
+        connections.close_all()
+
+
+def schedule_rebuild() -> None:
+    """
+    Function for rebuilding the page after PRERENDER_DELAY seconds, each call postpones the rebuild (debounce),
+    so a batch of admin changes is rendered once. Timer is not started again after the rebuild, pages with
+    started events are rebuilt by python manage.py prerender_main_page --expired (cron).
+    """
+    global rebuild_timer
+    with rebuild_lock:
+        if rebuild_timer is not None:
+            rebuild_timer.cancel()
+        rebuild_timer = threading.Timer(settings.PRERENDER_DELAY, rebuild_static_page)
+        rebuild_timer.daemon = True
+        rebuild_timer.start()
+
+
+def page_changed() -> None:
+    """
+    Function for deleting stale page at once and rebuilding it later.
+    """
+    delete_static_page()
+    schedule_rebuild()
+
+
+def content_changed() -> None:
+    """
+    Function for reacting on changes in content models, the page is deleted and rebuilt after the change
+    is committed (immediately outside of transaction).
+    """
+    if settings.PRERENDER_PAGE:
+        transaction.on_commit(page_changed)
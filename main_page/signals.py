@@ -0,0 +1,95 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from site_reva_a.routers import pin_primary
+from . import prerender
+from .cache import bump_content_version
+from .images import image_field_names, generate_instance_derivatives
+from .menu import menu_changed
+from .models import CONTENT_MODELS, Category, Dishes, UserReservation
+from .slots import occupied_slot, change_occupancy
+
+
+def content_committed(model) -> None:
+    """
+    Function for changing content version when the change is committed, so pages rendered by other workers
+    from the rows before the commit are cached under the previous version.
+
+    :param model: Model class that was changed.
+    """
+    bump_content_version(model)
+    pin_primary()
+
+
+def content_changed(sender, **kwargs):
+    """
+    Receiver for post_save and post_delete signals of the content models.
+
+    :param sender: Model class that was changed.
+    """
+    transaction.on_commit(partial(content_committed, sender))
+    prerender.content_changed()
+
+
+for model in CONTENT_MODELS:
+    post_save.connect(content_changed, sender=model, dispatch_uid=f'content_saved_{model._meta.label_lower}')
+    post_delete.connect(content_changed, sender=model, dispatch_uid=f'content_deleted_{model._meta.label_lower}')
+
+
+def image_saved(sender, instance, raw=False, **kwargs):
+    """
+    Receiver for creating responsive derivatives of the uploaded images.
+    """
+    if not raw:
+        generate_instance_derivatives(instance)
+
+
+for model in CONTENT_MODELS:
+    if image_field_names(model):
+        post_save.connect(image_saved, sender=model, dispatch_uid=f'image_saved_{model._meta.label_lower}')
+
+
+@receiver(post_save, sender=Dishes, dispatch_uid='menu_dish_saved')
+@receiver(post_delete, sender=Dishes, dispatch_uid='menu_dish_deleted')
+@receiver(post_save, sender=Category, dispatch_uid='menu_category_saved')
+@receiver(post_delete, sender=Category, dispatch_uid='menu_category_deleted')
+def menu_content_changed(sender, **kwargs):
+    """
+    Receiver for rebuilding menu projection after saved or deleted dish or category is committed.
+    """
+    menu_changed()
+
+
+@receiver(pre_save, sender=UserReservation, dispatch_uid='occupancy_reservation_saving')
+def reservation_saving(sender, instance, raw=False, **kwargs):
+    """
+    Receiver for remembering slot occupied by the reservation before it is changed.
+    """
+    instance._saved_slot = None
+    if instance.pk is not None and not raw:
+        saved = sender.objects.filter(pk=instance.pk).first()
+        instance._saved_slot = occupied_slot(saved) if saved is not None else None
+
+
+@receiver(post_save, sender=UserReservation, dispatch_uid='occupancy_reservation_saved')
+def reservation_saved(sender, instance, raw=False, **kwargs):
+    """
+    Receiver for moving persons of the saved reservation in the slot occupancy index.
+    """
+    if raw:
+        return
+    saved, current = getattr(instance, '_saved_slot', None), occupied_slot(instance)
+    if saved != current:
+        change_occupancy(saved, -1)
+        change_occupancy(current, 1)
+
+
+@receiver(post_delete, sender=UserReservation, dispatch_uid='occupancy_reservation_deleted')
+def reservation_deleted(sender, instance, **kwargs):
+    """
+    Receiver for removing persons of the deleted reservation from the slot occupancy index.
+    """
+    change_occupancy(occupied_slot(instance), -1)
@@ -0,0 +1,60 @@
+import threading
+import time
+
+from django.conf import settings
+
+from .cache import content_version
+from .models import InformationInContactUs, Footer, AboutUs, ThisIsForTest
+
+
+class SingletonStore:
+    """
+    Process-wide store of the models that have only one object on the site.
+
+    Objects are loaded once per worker and reloaded when content version of the models changes
+    or when they are older than MAIN_PAGE_CACHE_TIMEOUT (version stamps can be private for a worker
+    with local memory cache).
+
+    models - Dictionary with context names and model classes.\n
+    """
+
+    def __init__(self, models: dict):
+        self.models = models
+        self.labels = [model._meta.label_lower for model in models.values()]
+        self.objects = {}
+        self.version = None
+        self.loaded_at = 0.0
+        self.lock = threading.Lock()
+
+    def is_fresh(self, version: str) -> bool:
+        """
+        Function checked if loaded objects are still actual.
+
+        :param version: Current content version of the models.
+        :return: True or False.
+        """
+        age = time.monotonic() - self.loaded_at
+        return version == self.version and age < settings.MAIN_PAGE_CACHE_TIMEOUT
+
+    def get_all(self) -> dict:
+        """
+        Function for getting all objects of the store.
+
+        :return: Dictionary with context names and objects (None if object is not created yet).
+        """
+        version = content_version(*self.labels)
+        if not self.is_fresh(version):
+            with self.lock:
+                if not self.is_fresh(version):
+                    self.objects = {name: model.objects.first() for name, model in self.models.items()}
+                    self.version = version
+                    self.loaded_at = time.monotonic()
+        return self.objects
+
+
+site_content_store = SingletonStore({
+    'information_in_contact_us': InformationInContactUs,
+    'footer': Footer,
+    'about_us': AboutUs,
+    'test': ThisIsForTest,
+})
@@ -0,0 +1,164 @@
+import datetime
+from collections import Counter
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F, Sum
+
+from .models import SlotCapacity, SlotOccupancy, UserReservation
+
+
+class SlotIsFull(ValidationError):
+    """
+    Raised when reservation does not fit into the time slot and waitlist is turned off.
+    """
+
+
+def minutes(value: datetime.time) -> int:
+    """
+    Function for converting time to minutes from midnight.
+
+    :param value: Time.
+    :return: Number of minutes.
+    """
+    return value.hour * 60 + value.minute
+
+
+def slot_start(value: datetime.time) -> datetime.time:
+    """
+    Function for getting start of the time slot that contains the time.
+
+    :param value: Time of reservation.
+    :return: Start time of the slot.
+    """
+    start = minutes(value) - minutes(value) % settings.RESERVATION_SLOT_MINUTES
+    return datetime.time(start // 60, start % 60)
+
+
+def schedule() -> list:
+    """
+    Function for getting all time slots between RESERVATION_OPENING_TIME and RESERVATION_CLOSING_TIME.
+
+    :return: List of start times of the slots.
+    """
+    opening = minutes(datetime.time.fromisoformat(settings.RESERVATION_OPENING_TIME))
+    closing = minutes(datetime.time.fromisoformat(settings.RESERVATION_CLOSING_TIME))
+    return [
+        datetime.time(start // 60, start % 60)
+        for start in range(opening, closing, settings.RESERVATION_SLOT_MINUTES)
+    ]
+
+
+def is_open(value: datetime.time) -> bool:
+    """
+    Function for checking that reservation time is inside opening hours.
+
+    :param value: Time of reservation.
+    :return: True or False.
+    """
+    return slot_start(value) in schedule()
+
+
+def capacity(time_slot: datetime.time) -> int:
+    """
+    Function for getting number of seats in the slot with one indexed query.
+
+    :param time_slot: Start time of the slot.
+    :return: Number of seats.
+    """
+    seats = SlotCapacity.objects.filter(time_slot=time_slot).values_list('seats', flat=True).first()
+    return settings.RESERVATION_DEFAULT_SEATS if seats is None else seats
+
+
+def occupied_slot(reservation: UserReservation):
+    """
+    Function for getting slot occupied by the reservation.
+
+    :param reservation: UserReservation object.
+    :return: Tuple (date, start time of the slot, persons) or None for waitlisted request.
+    """
+    if reservation.is_waitlisted or reservation.date_reservation is None or reservation.time_reservation is None:
+        return None
+    return reservation.date_reservation, slot_start(reservation.time_reservation), int(reservation.persons)
+
+
+def change_occupancy(slot, sign: int) -> None:
+    """
+    Function for adding or removing persons of the reservation to the occupancy index.
+
+    :param slot: Tuple (date, start time of the slot, persons) or None.
+    :param sign: 1 for adding, -1 for removing.
+    """
+    if slot is None:
+        return
+    date_reservation, time_slot, persons = slot
+    occupancy, _ = SlotOccupancy.objects.get_or_create(date_reservation=date_reservation, time_slot=time_slot)
+    SlotOccupancy.objects.filter(pk=occupancy.pk).update(seats_taken=F('seats_taken') + sign * persons)
+
+
+def reserve(reservation: UserReservation) -> UserReservation:
+    """
+    Function for saving new reservation if it fits into the time slot.
+
+    Occupancy row of the slot is locked until the end of transaction, so concurrent requests for the same slot
+    are checked one by one. The check does not depend on number of reservations: one occupancy row and one
+    capacity row are read.
+
+    :param reservation: Unsaved UserReservation object.
+    :return: Saved object, is_waitlisted is set when the slot is full and RESERVATION_WAITLIST is on.
+    """
+    time_slot = slot_start(reservation.time_reservation)
+    with transaction.atomic():
+        occupancy, _ = SlotOccupancy.objects.get_or_create(
+            date_reservation=reservation.date_reservation, time_slot=time_slot,
+        )
+        occupancy = SlotOccupancy.objects.select_for_update().get(pk=occupancy.pk)
+        if occupancy.seats_taken + int(reservation.persons) > capacity(time_slot):
+            if not settings.RESERVATION_WAITLIST:
+                raise SlotIsFull('There are no free tables for this time, please choose another one.')
+            reservation.is_waitlisted = True
+        reservation.save()
+    return reservation
+
+
+def rebuild_occupancy(batch_size: int = 1000) -> int:
+    """
+    Function for building the slot occupancy index again from all reservations.
+
+    Needed after rows are written without signals (bulk_create, loaddata), persons are summed by the database.
+
+    :param batch_size: Number of occupancy rows inserted by one query.
+    :return: Number of occupancy rows.
+    """
+    taken = Counter()
+    rows = UserReservation.objects.filter(is_waitlisted=False).order_by().values(
+        'date_reservation', 'time_reservation',
+    ).annotate(persons_sum=Sum('persons'))
+    for row in rows.iterator():
+        taken[row['date_reservation'], slot_start(row['time_reservation'])] += row['persons_sum']
+    with transaction.atomic():
+        SlotOccupancy.objects.all().delete()
+        SlotOccupancy.objects.bulk_create((
+            SlotOccupancy(date_reservation=date_reservation, time_slot=time_slot, seats_taken=seats_taken)
+            for (date_reservation, time_slot), seats_taken in taken.items()
+        ), batch_size=batch_size)
+    return len(taken)
+
+
+def available_slots(date: datetime.date) -> list:
+    """
+    Function for getting free seats in every slot of the day from the occupancy index.
+
+    :param date: Date of reservation.
+    :return: List of dictionaries with start time (time) and number of free seats (seats).
+    """
+    taken = dict(SlotOccupancy.objects.filter(date_reservation=date).values_list('time_slot', 'seats_taken'))
+    capacities = dict(SlotCapacity.objects.values_list('time_slot', 'seats'))
+    return [
+        {
+            'time': time_slot.strftime('%H:%M'),
+            'seats': max(capacities.get(time_slot, settings.RESERVATION_DEFAULT_SEATS) - taken.get(time_slot, 0), 0),
+        }
+        for time_slot in schedule()
+    ]
@@ -0,0 +1,99 @@
+import posixpath
+from functools import lru_cache
+
+from django import template
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+from ..assets import CRITICAL_CSS_NAME, CSS_URL_RE, bundle_path, is_relative_url
+
+register = template.Library()
+
+
+def asset_tag(path: str, preload: bool = False) -> str:
+    """
+    Function for rendering <link> or <script> tag of the static file.
+
+    :param path: Static path of the file.
+    :param preload: Load stylesheet without blocking the first paint.
+    :return: HTML.
+    """
+    url = static(path)
+    if path.endswith('.js'):
+        return format_html('<script src="{}"></script>', url)
+    if preload:
+        return format_html(
+            '<link rel="preload" href="{0}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+            '<noscript><link href="{0}" rel="stylesheet"></noscript>', url,
+        )
+    return format_html('<link href="{}" rel="stylesheet">', url)
+
+
+@register.simple_tag
+def asset_bundle(name, preload=False):
+    """
+    Tag for including bundle from ASSET_BUNDLES.
+
+    Usage: {% asset_bundle 'site.css' preload=True %}
+
+    Bundle is used when USE_ASSET_BUNDLES is on (python manage.py build_assets before collectstatic),
+    other way or if bundle is not collected yet the source files are included one by one.
+
+    :param name: Name of the bundle.
+    :param preload: Load stylesheet without blocking the first paint, used with critical_css.
+    :return: HTML.
+    """
+    if settings.USE_ASSET_BUNDLES:
+        try:
+            return asset_tag(bundle_path(name), preload)
+        except ValueError:
+            pass
+    return format_html_join('\n', '{}', ((asset_tag(path), ) for path in settings.ASSET_BUNDLES[name]))
+
+
+@lru_cache
+def read_critical_css() -> str:
+    """
+    Function for reading critical stylesheet once per process, its urls are rewritten to static urls.
+
+    :return: Stylesheet or empty string if it is not built.
+    """
+    path = bundle_path(CRITICAL_CSS_NAME)
+    full_path = finders.find(path) if settings.DEBUG else None
+    try:
+        if full_path:
+            with open(full_path, encoding='utf-8') as file:
+                css = file.read()
+        else:
+            with staticfiles_storage.open(path) as file:
+                css = file.read().decode()
+    except (OSError, ValueError):
+        return ''
+    directory = posixpath.dirname(path)
+
+    def to_static(match):
+        quote, url = match.groups()
+        if not is_relative_url(url):
+            return match.group(0)
+        return f'url({quote}{static(posixpath.normpath(posixpath.join(directory, url)))}{quote})'
+
+    return CSS_URL_RE.sub(to_static, css)
+
+
+@register.simple_tag
+def critical_css():
+    """
+    Tag for inlining styles of the above-the-fold elements (header and hero), see ASSET_CRITICAL_SELECTORS.
+
+    Usage: {% critical_css %}
+
+    :return: <style> tag or empty string when bundles are not used.
+    """
+    if not settings.USE_ASSET_BUNDLES:
+        return ''
+    css = read_critical_css()
+    return mark_safe(f'<style>{css}</style>') if css else ''
@@ -0,0 +1,78 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html, format_html_join
+
+from ..images import derivative_name, derivative_widths
+
+register = template.Library()
+
+
+def image_name(image) -> str:
+    """
+    Function for getting name of the image in the storage.
+
+    :param image: ImageField file or name of the file.
+    :return: Name of the file or empty string.
+    """
+    return getattr(image, 'name', image) or ''
+
+
+def srcset(name: str, widths: list, ext: str) -> str:
+    """
+    Function for getting value of the srcset attribute.
+
+    :param name: Name of the original file in the storage.
+    :param widths: Widths of the derivatives.
+    :param ext: Extension of the derivatives.
+    :return: Attribute value.
+    """
+    return ', '.join(f'{default_storage.url(derivative_name(name, width, ext))} {width}w' for width in widths)
+
+
+@register.simple_tag
+def responsive_image(image, sizes='100vw', **attrs):
+    """
+    Tag for rendering <picture> with WebP and JPEG derivatives of the image.
+
+    Usage: {% responsive_image dish.photo sizes="(min-width: 992px) 25vw, 100vw" class="img-fluid" alt="" %}
+
+    Original file is used when derivatives are not created yet.
+
+    :param image: ImageField file or name of the file.
+    :param sizes: Value of the sizes attribute.
+    :param attrs: Additional attributes of the <img> tag.
+    :return: HTML.
+    """
+    name = image_name(image)
+    if not name:
+        return ''
+    img_attrs = format_html_join('', ' {}="{}"', attrs.items())
+    widths = derivative_widths(name)
+    if not widths:
+        return format_html('<img src="{}"{}>', default_storage.url(name), img_attrs)
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" loading="lazy"{}></picture>',
+        srcset(name, widths, 'webp'), sizes,
+        default_storage.url(name), srcset(name, widths, 'jpg'), sizes, img_attrs,
+    )
+
+
+@register.simple_tag
+def image_url(image, width):
+    """
+    Tag for getting URL of the JPEG derivative not wider than the width, for background images and links.
+
+    Usage: {% image_url slide.photo 1920 %}
+
+    :param image: ImageField file or name of the file.
+    :param width: Maximum width.
+    :return: URL of the derivative or of the original file.
+    """
+    name = image_name(image)
+    if not name:
+        return ''
+    widths = [candidate for candidate in derivative_widths(name) if candidate <= width]
+    if not widths:
+        return default_storage.url(name)
+    return default_storage.url(derivative_name(name, widths[-1], 'jpg'))
@@ -0,0 +1,33 @@
+from django import template
+from django.conf import settings
+from django.utils.safestring import mark_safe
+
+from ..cache import content_version, get_cached_fragment, set_cached_fragment
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def cached_include(context, template_name, *labels, timeout=None):
+    """
+    Tag for including section template that is rendered once per version of its models.
+
+    Usage: {% cached_include 'chefs.html' 'main_page.crewmember' %}
+
+    Querysets of the section are not evaluated when the fragment is taken from the cache. Versions loaded
+    by the view (content_versions in context) are used, so the tag does not go to the cache for them.
+    Sections with forms and CSRF token must not be cached.
+
+    :param context: Context of the page.
+    :param template_name: Template of the section.
+    :param labels: Labels of the models used in the section.
+    :param timeout: Time to live in seconds, MAIN_PAGE_CACHE_TIMEOUT by default.
+    :return: HTML of the section.
+    """
+    version = content_version(*labels, versions=context.get('content_versions'))
+    fragment = get_cached_fragment(template_name, version)
+    if fragment is None:
+        fragment = context.template.engine.get_template(template_name).render(context)
+        set_cached_fragment(template_name, version, fragment,
+                            settings.MAIN_PAGE_CACHE_TIMEOUT if timeout is None else timeout)
+    return mark_safe(fragment)
@@ -1,3 +1,334 @@
-from django.test import TestCase
+import datetime
+import os
+import tempfile
+from io import BytesIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import path
+from PIL import Image
+
+from site_reva_a import urls
+from site_reva_a.middleware import recent_metrics
+from site_reva_a.testing import ViewBudgetMixin
+from . import prerender
+from .cache import content_version, content_versions, cached_fragment_names
+from .images import derivative_widths, generate_derivatives
+from .menu import get_menu
+from .models import Category, Dishes, UserReservation, SlotCapacity, SlotOccupancy
+from .slots import SlotIsFull, reserve
+from .views import SECTION_FRAGMENTS, main_page_async
+
+User = get_user_model()
+
+# Site URLs with the async main page (ASYNC_MAIN_PAGE).
+urlpatterns = [path('', main_page_async, name='main_page'), *urls.urlpatterns]
+
+
+class MenuProjectionTest(TestCase):
+    """
+    Menu projection is rebuilt after committed changes of categories and dishes only.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name='Soups', position=1)
+
+    def setUp(self):
+        cache.clear()
+
+    def create_dish(self, name, **fields):
+        return Dishes.objects.create(name=name, slug=name.lower(), position=1, price=10, ingredients='water',
+                                     category=self.category, **fields)
+
+    def dish_names(self):
+        return [row['name'] for row in get_menu()['dishes']]
+
+    def test_committed_change(self):
+        self.assertEqual(self.dish_names(), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_dish('Borscht')
+        self.assertEqual(self.dish_names(), ['Borscht'])
+
+    def test_menu_built_before_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            dish = self.create_dish('Borscht')
+            # Another worker builds the projection while the transaction is open.
+            self.assertEqual(self.dish_names(), ['Borscht'])
+            dish.is_visible = False
+            dish.save()
+            self.assertEqual(self.dish_names(), ['Borscht'])
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.dish_names(), [])
+
+    def test_rolled_back_change(self):
+        self.assertEqual(self.dish_names(), [])
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                self.create_dish('Borscht')
+                raise RuntimeError
+        self.assertEqual(callbacks, [])
+        self.assertEqual(self.dish_names(), [])
+
+    def test_hidden_category(self):
+        self.create_dish('Borscht')
+        self.category.is_visible = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.save()
+        self.assertEqual(get_menu()['categories'], [])
+        self.assertEqual(self.dish_names(), [])
+
+
+class ContentVersionTest(TestCase):
+    """
+    Cached pages and sections are invalidated when the change of content is committed.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def test_version_changed_on_commit(self):
+        version = content_version()
+        with self.captureOnCommitCallbacks() as callbacks:
+            Category.objects.create(name='Soups', position=1)
+        self.assertEqual(content_version(), version)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(content_version(), version)
+
+    def test_section_fragments(self):
+        self.assertEqual(cached_fragment_names(SECTION_FRAGMENTS, content_versions()), set())
+        self.client.get('/')
+        # Async view skips loading of these sections, they must match the template.
+        self.assertEqual(cached_fragment_names(SECTION_FRAGMENTS, content_versions()), set(SECTION_FRAGMENTS))
+
+    def test_cached_page_replaced(self):
+        self.assertNotContains(self.client.get('/'), 'Soups')
+        with self.captureOnCommitCallbacks(execute=True):
+            Category.objects.create(name='Soups', position=1)
+        self.assertContains(self.client.get('/'), 'Soups')
+
+
+class ViewBudgetTest(ViewBudgetMixin, TestCase):
+    """
+    Main page stays within its budget for anonymous, logged in and staff users.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='john', password='secret-password')
+        cls.staff = User.objects.create_user(username='admin', password='secret-password', is_staff=True)
+        category = Category.objects.create(name='Soups', position=1)
+        for number in range(20):
+            Dishes.objects.create(name=f'Dish {number}', slug=f'dish-{number}', position=number, price=10,
+                                  ingredients='water', category=category)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_anonymous(self):
+        self.assert_within_budget('/', 'main_page')
+        # Cached page.
+        self.assert_within_budget('/', 'main_page')
+
+    def test_logged_in(self):
+        self.client.force_login(self.user)
+        self.assert_within_budget('/', 'main_page')
+
+    def test_server_timing(self):
+        self.assertNotIn('Server-Timing', self.assert_within_budget('/', 'main_page'))
+        self.client.force_login(self.staff)
+        self.assertIn('Server-Timing', self.assert_within_budget('/', 'main_page'))
+
+
+class DerivativeWidthsTest(TestCase):
+    """
+    Widths of the image derivatives are saved when they are created, pages don't check the storage.
+    """
+
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings = self.settings(MEDIA_ROOT=media_root.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        buffer = BytesIO()
+        Image.new('RGB', (800, 600)).save(buffer, 'JPEG')
+        self.name = default_storage.save('photo/test.jpg', ContentFile(buffer.getvalue()))
+
+    def test_widths_saved(self):
+        generate_derivatives(self.name)
+        with mock.patch.object(FileSystemStorage, 'exists') as exists:
+            self.assertEqual(derivative_widths(self.name), [320, 640])
+        exists.assert_not_called()
+
+    def test_widths_checked_once(self):
+        generate_derivatives(self.name)
+        cache.clear()
+        self.assertEqual(derivative_widths(self.name), [320, 640])
+        with mock.patch.object(FileSystemStorage, 'exists') as exists:
+            self.assertEqual(derivative_widths(self.name), [320, 640])
+        exists.assert_not_called()
+
+
+class SlotOccupancyTest(TestCase):
+    """
+    Reservations are accepted up to the capacity of the slot, occupancy index follows saved and deleted ones.
+    """
+
+    date = datetime.date(2030, 1, 1)
+
+    @classmethod
+    def setUpTestData(cls):
+        SlotCapacity.objects.create(time_slot=datetime.time(12), seats=4)
+
+    def reserve(self, persons, time=datetime.time(12, 15)):
+        return reserve(UserReservation(name='Guest', email='guest@mail.com', phone='050 123 4567',
+                                       date_reservation=self.date, time_reservation=time, persons=persons))
+
+    def seats_taken(self, time_slot=datetime.time(12)):
+        occupancy = SlotOccupancy.objects.filter(date_reservation=self.date, time_slot=time_slot).first()
+        return occupancy.seats_taken if occupancy else 0
+
+    def test_waitlisted_when_full(self):
+        self.assertFalse(self.reserve(2).is_waitlisted)
+        self.assertFalse(self.reserve(2, datetime.time(12)).is_waitlisted)
+        self.assertEqual(self.seats_taken(), 4)
+        self.assertTrue(self.reserve(1).is_waitlisted)
+        self.assertEqual(self.seats_taken(), 4)
+        # Next slot has default capacity.
+        self.assertFalse(self.reserve(5, datetime.time(12, 30)).is_waitlisted)
+
+    @override_settings(RESERVATION_WAITLIST=False)
+    def test_rejected_when_full(self):
+        self.reserve(3)
+        with self.assertRaises(SlotIsFull):
+            self.reserve(2)
+        self.assertEqual(UserReservation.objects.count(), 1)
+        self.assertEqual(self.seats_taken(), 3)
+
+    @override_settings(RESERVATION_WAITLIST=False)
+    def test_rejected_form(self):
+        self.reserve(4)
+        response = self.client.post('/', {
+            'name': 'Guest', 'email': 'guest@mail.com', 'phone': '050 123 4567', 'date_reservation': '2030-01-01',
+            'time_reservation': '12:20', 'persons': 1, 'message': 'Window table',
+        })
+        self.assertContains(response, 'There are no free tables for this time')
+        self.assertEqual(UserReservation.objects.count(), 1)
+
+    def test_moved_to_another_slot(self):
+        reservation = self.reserve(2)
+        reservation.time_reservation = datetime.time(13, 10)
+        reservation.save()
+        self.assertEqual(self.seats_taken(), 0)
+        self.assertEqual(self.seats_taken(datetime.time(13)), 2)
+        reservation.persons = 3
+        reservation.save()
+        self.assertEqual(self.seats_taken(datetime.time(13)), 3)
+
+    def test_waitlisted_and_deleted(self):
+        reservation = self.reserve(2)
+        self.reserve(1)
+        reservation.is_waitlisted = True
+        reservation.save()
+        self.assertEqual(self.seats_taken(), 1)
+        reservation.is_waitlisted = False
+        reservation.save()
+        self.assertEqual(self.seats_taken(), 3)
+        reservation.delete()
+        self.assertEqual(self.seats_taken(), 1)
+
+    def test_reservation_slots(self):
+        self.reserve(3)
+        self.reserve(10, datetime.time(19))
+        with self.assertNumQueries(2):
+            response = self.client.get('/reservations/slots/', {'date': '2030-01-01'})
+        slots = {slot['time']: slot['seats'] for slot in response.json()['slots']}
+        self.assertEqual(slots['11:00'], 40)
+        self.assertEqual(slots['12:00'], 1)
+        self.assertEqual(slots['19:00'], 30)
+        self.assertEqual(len(slots), 24)
+
+    def test_reservation_slots_wrong_date(self):
+        self.assertEqual(self.client.get('/reservations/slots/').status_code, 400)
+        self.assertEqual(self.client.get('/reservations/slots/', {'date': '2030-02-30'}).status_code, 400)
+
+
+class PrerenderTest(TestCase):
+    """
+    Pre-rendered page is replaced without gaps and rebuilt once after a committed change.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+        settings = self.settings(PRERENDER_ROOT=self.root.name, PRERENDER_PAGE=True)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_rebuild(self):
+        prerender.build_static_page()
+        self.assertFalse(prerender.page_expired())
+        Category.objects.create(name='Soups', position=1)
+        cache.clear()
+        with mock.patch('os.remove', wraps=os.remove) as remove:
+            prerender.build_static_page()
+        # Page and its variants are replaced, not deleted, while visitors are served (Brotli variant is
+        # removed only if brotli is not installed).
+        removed = {os.path.basename(call.args[0]) for call in remove.call_args_list}
+        self.assertFalse(removed & {'index.html', 'index.html.gz'})
+        with open(prerender.page_path(), 'rb') as file:
+            self.assertTrue(b'Soups' in file.read())
+        self.assertIn('index.html.gz', os.listdir(self.root.name))
+        self.assertFalse(any(name.endswith('.tmp') for name in os.listdir(self.root.name)))
+
+    def test_served_to_anonymous(self):
+        prerender.build_static_page()
+        response = self.client.get('/')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        self.assertIn(b'csrf-token-placeholder', b''.join(response.streaming_content))
+
+    def test_content_changed_on_commit(self):
+        prerender.build_static_page()
+        with mock.patch.object(prerender, 'schedule_rebuild') as schedule_rebuild:
+            with self.captureOnCommitCallbacks() as callbacks:
+                Category.objects.create(name='Soups', position=1)
+                Category.objects.create(name='Salads', position=2)
+            self.assertTrue(os.path.exists(prerender.page_path()))
+            for callback in callbacks:
+                callback()
+        self.assertFalse(os.path.exists(prerender.page_path()))
+        self.assertTrue(prerender.page_expired())
+        self.assertEqual(schedule_rebuild.call_count, 2)
+
+    def test_rebuild_not_scheduled_again(self):
+        with mock.patch.object(prerender, 'schedule_rebuild') as schedule_rebuild:
+            prerender.rebuild_static_page()
+        schedule_rebuild.assert_not_called()
+        self.assertTrue(os.path.exists(prerender.page_path()))
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncMainPageTest(TestCase):
+    """
+    Async main page is awaited by the middleware and its section queries are counted.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    async def test_main_page(self):
+        response = await self.async_client.get('/')
+        self.assertEqual(response.status_code, 200)
+        metrics = recent_metrics()[-1]
+        self.assertEqual(metrics['view'], 'main_page')
+        self.assertGreater(metrics['queries'], 0)
@@ -0,0 +1,244 @@
+import datetime
+import gzip
+import json
+import sys
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+
+from .models import SlotOccupancy
+
+DUMP_FORMAT = 'content-dump'
+DUMP_VERSION = 1
+# Derived data is rebuilt after the load (refresh_derived_data), so it is not dumped.
+SKIPPED_MODELS = (SlotOccupancy, )
+
+
+class DumpEncoder(DjangoJSONEncoder):
+    """
+    JSON encoder of the dump, datetimes and times keep microseconds (DjangoJSONEncoder cuts them to milliseconds).
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def dumped_models() -> list:
+    """
+    Function for getting models of the dump in dependency order: targets of foreign keys go first.
+
+    Groups, users, all main_page models and the tables of their many-to-many fields are dumped.
+    Permissions and content types are created by migrations, they are referenced by natural keys.
+
+    :return: List of model classes.
+    """
+    models = [Group, get_user_model()]
+    models += [model for model in apps.get_app_config('main_page').get_models() if model not in SKIPPED_MODELS]
+    models += [field.remote_field.through for model in list(models) for field in model._meta.local_many_to_many
+               if field.remote_field.through._meta.auto_created]
+    ordered = []
+
+    def visit(model):
+        if model in ordered:
+            return
+        for field in model._meta.concrete_fields:
+            if field.is_relation and field.related_model in models and field.related_model is not model:
+                visit(field.related_model)
+        ordered.append(model)
+
+    for model in models:
+        visit(model)
+    return ordered
+
+
+def natural_key_fields(model, models) -> dict:
+    """
+    Function for getting foreign keys to the models that are not dumped, they are written as natural keys.
+
+    :return: Dictionary with attnames and related models.
+    """
+    return {field.attname: field.related_model for field in model._meta.concrete_fields
+            if field.is_relation and field.related_model not in models}
+
+
+@contextmanager
+def open_dump(path: str, mode: str):
+    """
+    Context manager for opening dump file, .gz files are compressed, - is stdin or stdout.
+
+    :param path: Path of the file.
+    :param mode: 'r' or 'w'.
+    """
+    if path == '-':
+        yield sys.stdin if mode == 'r' else sys.stdout
+    elif path.endswith('.gz'):
+        with gzip.open(path, mode + 't', encoding='utf-8') as file:
+            yield file
+    else:
+        with open(path, mode, encoding='utf-8') as file:
+            yield file
+
+
+def dump_lines(chunk_size: int, log=None):
+    """
+    Generator of JSON Lines of the dump: header and one line per row.
+
+    Rows are read with QuerySet.iterator(), memory use does not depend on number of rows.
+
+    :param chunk_size: Number of rows fetched from the database at once.
+    :param log: Function for progress messages.
+    """
+    log = log or (lambda message: None)
+    models = dumped_models()
+    yield json.dumps({'format': DUMP_FORMAT, 'version': DUMP_VERSION}) + '\n'
+    for model in models:
+        natural_keys = natural_key_fields(model, models)
+        related_keys = {}
+        attnames = [field.attname for field in model._meta.concrete_fields]
+        count = 0
+        for row in model._base_manager.order_by('pk').values(*attnames).iterator(chunk_size=chunk_size):
+            for attname, related_model in natural_keys.items():
+                if row[attname] is not None:
+                    if (related_model, row[attname]) not in related_keys:
+                        related_keys[related_model, row[attname]] = list(
+                            related_model._base_manager.get(pk=row[attname]).natural_key())
+                    row[attname] = related_keys[related_model, row[attname]]
+            yield json.dumps({'model': model._meta.label_lower, 'fields': row}, cls=DumpEncoder) + '\n'
+            count += 1
+        log(f'{model._meta.label}: {count} rows dumped.')
+
+
+@contextmanager
+def raw_dates(model):
+    """
+    Context manager for keeping dumped values of auto_now and auto_now_add fields, bulk_create replaces them
+    with the current time otherwise.
+    """
+    fields = [field for field in model._meta.concrete_fields
+              if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def insert_rows(model, rows: list) -> None:
+    """
+    Function for inserting rows of one model with one query, existing rows with the same primary key are updated
+    (like loaddata does) where the database supports it.
+
+    :param model: Model class.
+    :param rows: Dictionaries with attnames and values in Python types.
+    """
+    objects = [model(**row) for row in rows]
+    options = {}
+    if connection.features.supports_update_conflicts:
+        options['update_conflicts'] = True
+        options['update_fields'] = [field.name for field in model._meta.concrete_fields if not field.primary_key]
+        if connection.features.supports_update_conflicts_with_target:
+            options['unique_fields'] = [model._meta.pk.name]
+    with raw_dates(model):
+        model._base_manager.bulk_create(objects, **options)
+
+
+def parse_lines(lines, models: dict, log):
+    """
+    Generator of the dump rows converted to Python types.
+
+    Many-to-many rows pointing to permissions that do not exist in this database (of removed models)
+    are skipped.
+
+    :param lines: Iterator of JSON Lines.
+    :param models: Dictionary with labels and model classes.
+    :param log: Function for progress messages.
+    :return: Tuples (model, row).
+    """
+    header = json.loads(next(lines, 'null'))
+    if not header or header.get('format') != DUMP_FORMAT or header.get('version') != DUMP_VERSION:
+        raise ValueError(f'Not a {DUMP_FORMAT} file of version {DUMP_VERSION}')
+    fields = {}
+    related_keys = {}
+    for line in lines:
+        if not line.strip():
+            continue
+        data = json.loads(line)
+        model = models.get(data['model'])
+        if model is None:
+            raise ValueError(f"Model {data['model']} is not loaded by this command")
+        if model not in fields:
+            fields[model] = {field.attname: field for field in model._meta.concrete_fields}
+        row = {}
+        for attname, value in data['fields'].items():
+            field = fields[model][attname]
+            if isinstance(value, list) and field.is_relation:
+                key = (field.related_model, tuple(value))
+                if key not in related_keys:
+                    try:
+                        related_keys[key] = field.related_model._default_manager.get_by_natural_key(*value).pk
+                    except ObjectDoesNotExist:
+                        if not model._meta.auto_created:
+                            raise
+                        related_keys[key] = None
+                        log(f'{field.related_model._meta.label} {value} does not exist, its rows are skipped.')
+                value = related_keys[key]
+                if value is None:
+                    break
+            elif value is not None:
+                value = field.to_python(value)
+            row[attname] = value
+        else:
+            yield model, row
+
+
+def load_lines(lines, batch_size: int, log=None) -> dict:
+    """
+    Function for loading the dump in one transaction with bulk_create batches.
+
+    Constraint checks are disabled during the load where the database allows it and all tables are checked
+    at the end, sequences of the primary keys are reset after explicit values.
+
+    :param lines: Iterator of JSON Lines.
+    :param batch_size: Number of rows inserted by one query.
+    :param log: Function for progress messages.
+    :return: Dictionary with model labels and number of loaded rows.
+    """
+    log = log or (lambda message: None)
+    models = {model._meta.label_lower: model for model in dumped_models()}
+    loaded = {}
+    rows = parse_lines(iter(lines), models, log)
+
+    def flush(model, batch):
+        insert_rows(model, batch)
+        loaded[model._meta.label] = loaded.get(model._meta.label, 0) + len(batch)
+        log(f'{model._meta.label}: {loaded[model._meta.label]} rows loaded.')
+
+    with transaction.atomic():
+        with connection.constraint_checks_disabled():
+            model, batch = None, []
+            for row_model, row in rows:
+                if batch and (row_model is not model or len(batch) >= batch_size):
+                    flush(model, batch)
+                    batch = []
+                model = row_model
+                batch.append(row)
+            if batch:
+                flush(model, batch)
+        tables = [models[label.lower()]._meta.db_table for label in loaded]
+        connection.check_constraints(table_names=tables)
+        sequences = connection.ops.sequence_reset_sql(no_style(), [models[label.lower()] for label in loaded])
+        with connection.cursor() as cursor:
+            for sql in sequences:
+                cursor.execute(sql)
+    return loaded
@@ -1,11 +1,168 @@
-import datetime
+import asyncio
+from functools import partial
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import JsonResponse
+from django.middleware.csrf import get_token
 from django.shortcuts import render, HttpResponse, redirect
-from .models import Category, Dishes, AboutUs, BlockOfInformation, Events, PhotoToGallery, CrewMember, \
-    CustomerFeedback, HeroSection, ThisIsForTest, InformationInContactUs, Footer
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_safe
+from account.roles import is_manager
+from site_reva_a.routers import replica_reads
+from .cache import content_version, content_versions, get_cached_page, set_cached_page, cached_fragment_names
+from .menu import get_menu
+from .models import BlockOfInformation, Events, PhotoToGallery, CrewMember, \
+    CustomerFeedback, HeroSection
 from .forms import UserReservationForm, ContactUsForm
+from .singletons import site_content_store
+from .slots import SlotIsFull, available_slots
 # Create your views here.
 
+CSRF_TOKEN_PLACEHOLDER = 'csrf-token-placeholder'
+
+# Sections included with cached_include in main_page.html (keep them the same): context name, template
+# and labels of the models.
+# Events are not here, they are needed for the time to live of the page.
+SECTION_FRAGMENTS = {
+    'blocks_with_info': ('whu_us.html', ('main_page.blockofinformation', )),
+    'photo_in_gallery': ('gallery.html', ('main_page.phototogallery', )),
+    'crew_member': ('chefs.html', ('main_page.crewmember', )),
+    'testimonials': ('testimonials.html', ('main_page.customerfeedback', )),
+    'hero': ('hero.html', ('main_page.herosection', )),
+}
+
+
+def page_timeout(events) -> int:
+    """
+    Function for getting time to live of the cached main page.
+
+    The page shows only upcoming events, so it must not outlive the start of the nearest one.
+
+    :param events: Evaluated queryset of the upcoming events.
+    :return: Timeout in seconds.
+    """
+    timeout = settings.MAIN_PAGE_CACHE_TIMEOUT
+    if events:
+        until_event = (events[0].event_date_and_time - timezone.now()).total_seconds()
+        timeout = min(timeout, max(int(until_event), 1))
+    return timeout
+
+
+def cached_page_response(request, content: bytes) -> HttpResponse:
+    """
+    Function for building response from the cached main page.
+
+    Cached page is shared between visitors, so CSRF token of the current visitor is put in place of
+    the placeholder.
+
+    :param request: GET request.
+    :param content: Cached page content.
+    :return: Response with the page.
+    """
+    token = get_token(request).encode()
+    return HttpResponse(content.replace(CSRF_TOKEN_PLACEHOLDER.encode(), token))
+
+
+def user_flags(request) -> tuple:
+    """
+    Function for getting authentication flags of the user.
+
+    :param request: Any request.
+    :return: Tuple (user_auth, user_manager).
+    """
+    user_auth = request.user.is_authenticated
+    user_manager = is_manager(request.user)
+    return user_auth, user_manager
+
+
+def lookup_cached_page(request, user_auth: bool) -> tuple:
+    """
+    Function for getting the main page from the cache for anonymous GET requests.
+
+    :param request: Any request.
+    :param user_auth: Is user logged in or not.
+    :return: Tuple (version, response). Version is None if page can't be cached, response is None on cache miss.
+    """
+    if request.method != 'GET' or user_auth:
+        return None, None
+    version = content_version()
+    content = get_cached_page(version)
+    if content is None:
+        return version, None
+    return version, cached_page_response(request, content)
+
+
+def menu_sections() -> dict:
+    """
+    Function for getting menu sections from the menu projection.
+
+    :return: Dictionary with categories, dishes and specials.
+    """
+    menu = get_menu()
+    return {'categories': menu['categories'], 'dishes': menu['dishes'], 'specials': menu['specials']}
+
+
+def section_querysets() -> dict:
+    """
+    Function for getting querysets of the main page sections, they don't depend on each other.
+
+    blocks_with_info - All objects of the BlockOfInformation model.\n
+    events - Events model objects filtered by date and time. If event date > than datetime.now,
+    event will be filtered out.\n
+    photo_in_gallery - all objects model PhotoToGallery.\n
+    crew_member - all objects model CrewMember.\n
+    testimonials - Objects model CustomerFeedback filtered by 'is_visible' marker.\n
+    hero - Objects of the model 'HeroSection'.\n
+
+    :return: Dictionary with querysets.
+    """
+    return {
+        'blocks_with_info': BlockOfInformation.objects.all(),
+        'events': Events.objects.filter(event_date_and_time__gt=timezone.now()),
+        'photo_in_gallery': PhotoToGallery.objects.all(),
+        'crew_member': CrewMember.objects.all(),
+        'testimonials': CustomerFeedback.objects.filter(is_visible=True),
+        'hero': HeroSection.objects.all(),
+    }
+
+
+def render_main_page(request, sections: dict, user_auth: bool, user_manager: bool, version=None,
+                     reservation_form=None) -> HttpResponse:
+    """
+    Function for rendering the main page.
+
+    If content version is passed, page is rendered for anonymous visitors and saved to the cache.
+    Sections without forms are cached separately by versions of their models (cached_include tag),
+    so after a change only sections of the changed model are rendered again.
+
+    :param request: Any request.
+    :param sections: Dictionary with data of the sections.
+    :param user_auth: Is user logged in or not.
+    :param user_manager: Is user in 'manager' group or not.
+    :param version: Content version of the page or None.
+    :param reservation_form: Rejected reservation form with errors or None.
+    :return: Response with the page.
+    """
+    data = {
+        **sections,
+        'reservation_form': reservation_form or UserReservationForm(),
+        'contact_us': ContactUsForm(),
+        'content_versions': content_versions(),
+        'user_manager': user_manager,
+        'user_auth': user_auth
+    }
+    if version is None:
+        return render(request, 'main_page.html', context=data)
+
+    data['csrf_token'] = CSRF_TOKEN_PLACEHOLDER
+    response = render(request, 'main_page.html', context=data)
+    set_cached_page(version, response.content, page_timeout(data['events']))
+    return cached_page_response(request, response.content)
+
 
 def main_page(request):
     """
@@ -18,10 +175,9 @@ def main_page(request):
     contact_us - Form of the model Contact Us.\n
     user_manager - Objects model 'UserManager' filtered by group 'manager'\n
     user_auth - Is user logged in or not.\n
-    categories - Category model objects filtered by 'is_visible' marker.\n
-    dishes - Dishes model objects filtered by 'is_visible' marker.\n
-    specials - Dishes model objects filtered by 'is_special' marker.\n
-    about_us - Object of the model 'About Us'\n
+    categories - Rows of the visible categories from the menu projection.\n
+    dishes - Rows of the visible dishes from the menu projection.\n
+    specials - Rows of the visible special dishes from the menu projection.\n
     blocks_with_info - All objects of the BlockOfInformation model.\n
     events - Events model objects filtered by date and time. If event date > than datetime.now,
     event will be filtered out.\n
@@ -30,60 +186,135 @@ def main_page(request):
     testimonials - Objects model CustomerFeedback filtered by 'is_visible' marker.\n
     hero - Object of the model 'HeroSection'.\n
     reservation - form UserReservationForm.\n
-    test - test feature.\n
     contact_us - form ContactUsForm.\n
-    information_in_contact_us - object model InformationInContactUs.\n
-    footer - object model Footer.\n
+
+    Reservation for the full time slot is shown again with error (or waitlisted, see main_page/slots.py).
+    About Us, test feature, contact information and footer come from the site_content context processor.
+
+    GET requests of anonymous users are served from the cache, the cache is invalidated by any change
+    in content models. Content is read from replicas when they are configured, forms are saved to the primary.
+    Sections are loaded lazily, querysets are evaluated while the template is rendered.
     """
 
+    rejected_reservation = None
     if request.method == 'POST':
         reservation = UserReservationForm(request.POST)
         contact_us = ContactUsForm(request.POST)
         if reservation.is_valid():
-            reservation.save()
-            return redirect('/')
+            try:
+                reservation.save()
+                return redirect('/')
+            except SlotIsFull as error:
+                reservation.add_error('time_reservation', error)
+                rejected_reservation = reservation
         if contact_us.is_valid():
             contact_us.save()
             return redirect('/')
 
-    user_manager = request.user.groups.filter(name='manager').exists()
-    user_auth = request.user.is_authenticated
-    categories = Category.objects.filter(is_visible=True)
-    dishes = Dishes.objects.filter(is_visible=True)
-    specials = Dishes.objects.filter(special=True)
-    about_us = AboutUs.objects.get()
-    blocks_with_info = BlockOfInformation.objects.all()
-    events = Events.objects.filter(event_date_and_time__gt=datetime.datetime.now())
-    photo_in_gallery = PhotoToGallery.objects.all()
-    crew_member = CrewMember.objects.all()
-    testimonials = CustomerFeedback.objects.filter(is_visible=True).all()
-    hero = HeroSection.objects.all()
-    reservation = UserReservationForm()
-    test = ThisIsForTest.objects.get()
-    contact_us = ContactUsForm()
-    information_in_contact_us = InformationInContactUs.objects.get()
-    footer = Footer.objects.get()
+    with replica_reads():
+        user_auth, user_manager = user_flags(request)
+        version, response = lookup_cached_page(request, user_auth)
+        if response is not None:
+            return response
 
-    data = {
-        'categories': categories,
-        'dishes': dishes,
-        'specials': specials,
-        'about_us': about_us,
-        'blocks_with_info': blocks_with_info,
-        'events': events,
-        'photo_in_gallery': photo_in_gallery,
-        'crew_member': crew_member,
-        'testimonials': testimonials,
-        'hero': hero,
-        'reservation_form': reservation,
-        'test': test,
-        'contact_us': contact_us,
-        'information_in_contact_us': information_in_contact_us,
-        'footer': footer,
-        'user_manager': user_manager,
-        'user_auth': user_auth
+        sections = {**menu_sections(), **section_querysets()}
+        return render_main_page(request, sections, user_auth, user_manager, version, rejected_reservation)
 
 
+def load_section(loader):
+    """
+    Function for loading one section in a separate thread with its own database connection.
 
-    }
-    return render(request, 'main_page.html', context=data)
+    Connections are closed or kept the same way as after the request (CONN_MAX_AGE).
+
+    :param loader: Function without arguments.
+    :return: Result of the loader.
+    """
+    close_old_connections()
+    try:
+        return loader()
+    finally:
+        close_old_connections()
+
+
+async def load_sections_concurrently(loaders: dict) -> dict:
+    """
+    Function for running section loaders at the same time.
+
+    Django async ORM runs all queries in one shared thread, so loaders are started in separate threads
+    (thread_sensitive=False) and the page waits only for the slowest one.
+
+    :param loaders: Dictionary with section names and loaders.
+    :return: Dictionary with section names and results.
+    """
+    results = await asyncio.gather(*(
+        sync_to_async(load_section, thread_sensitive=False)(loader) for loader in loaders.values()
+    ))
+    return dict(zip(loaders, results))
+
+
+async def main_page_async(request):
+    """
+    Async view function of the main page for ASGI deployment. Processed POST and GET requests.
+
+    Independent sections (menu, events, gallery, crew, testimonials, hero, single-object content)
+    are loaded concurrently. Sections found in the fragment cache are not loaded, their querysets stay lazy
+    like in the main_page view. POST requests are passed to the main_page view.
+    Enabled with ASYNC_MAIN_PAGE environment variable.
+
+    :param request: POST or GET request.
+    :return: Render of the HTML-page with context.
+    """
+    if request.method != 'GET':
+        return await sync_to_async(main_page)(request)
+
+    with replica_reads():
+        user_auth, user_manager = await sync_to_async(user_flags)(request)
+        version, response = await sync_to_async(lookup_cached_page)(request, user_auth)
+        if response is not None:
+            return response
+
+        versions = await sync_to_async(content_versions)()
+        cached = await sync_to_async(cached_fragment_names)(SECTION_FRAGMENTS, versions)
+        sections = section_querysets()
+        loaders = {name: partial(list, queryset) for name, queryset in sections.items() if name not in cached}
+        loaders['menu'] = menu_sections
+        loaders['site_content'] = site_content_store.get_all
+        sections.update(await load_sections_concurrently(loaders))
+        sections.update(sections.pop('menu'))
+        # Single-object content is loaded to the store and is taken by the context processor.
+        sections.pop('site_content')
+        return await sync_to_async(render_main_page)(request, sections, user_auth, user_manager, version)
+
+
+@require_safe
+def reservation_slots(request):
+    """
+    View function of the available reservation slots. Processed GET requests.
+
+    Free seats are read from the slot occupancy index, reservations are not counted.
+
+    :param request: GET request with date in format YYYY-MM-DD.
+    :return: JSON with date and list of slots (time, seats), 400 for missing or wrong date.
+    """
+    try:
+        date = parse_date(request.GET.get('date', ''))
+    except ValueError:
+        date = None
+    if date is None:
+        return JsonResponse({'error': 'Date in format YYYY-MM-DD is required'}, status=400)
+    return JsonResponse({'date': date.isoformat(), 'slots': available_slots(date)})
+
+
+@never_cache
+@require_safe
+def csrf_token(request):
+    """
+    View function of the CSRF token for the pre-rendered main page. Processed GET requests.
+
+    CSRF cookie is set with the response.
+
+    :param request: GET request.
+    :return: JSON with token.
+    """
+    return JsonResponse({'token': get_token(request)})
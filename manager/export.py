@@ -0,0 +1,83 @@
+import csv
+import json
+from itertools import islice
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+# Columns of the exported files.
+RESERVATION_EXPORT_FIELDS = ('pk', 'name', 'email', 'phone', 'date_reservation', 'time_reservation', 'persons',
+                             'message', 'date_of_the_request', 'is_processed', 'is_waitlisted')
+CONTACT_EXPORT_FIELDS = ('pk', 'name', 'email', 'subject', 'message', 'date_of_the_request', 'is_processed')
+
+EXPORT_CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class Echo:
+    """
+    File-like object for csv.writer, written line is returned instead of being stored.
+    """
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows, fields: tuple):
+    """
+    Generator of CSV lines with header.
+
+    :param rows: Iterator of tuples.
+    :param fields: Names of the columns.
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def ndjson_lines(rows, fields: tuple):
+    """
+    Generator of JSON objects, one per line.
+
+    :param rows: Iterator of tuples.
+    :param fields: Names of the keys.
+    """
+    for row in rows:
+        yield json.dumps(dict(zip(fields, row)), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def batched(lines, size: int):
+    """
+    Generator joining lines into chunks, so the server writes the response with fewer calls.
+
+    :param lines: Iterator of strings.
+    :param size: Number of lines in one chunk.
+    """
+    while chunk := ''.join(islice(lines, size)):
+        yield chunk
+
+
+def export_response(queryset, fields: tuple, export_format: str, filename: str) -> StreamingHttpResponse:
+    """
+    Function for streaming rows of the queryset to the file.
+
+    Rows are read with QuerySet.iterator() by EXPORT_CHUNK_SIZE, so memory use does not depend on
+    number of rows (server-side cursor on PostgreSQL).
+
+    :param queryset: Filtered queryset.
+    :param fields: Exported fields.
+    :param export_format: csv or ndjson.
+    :param filename: Name of the file without extension.
+    :return: Streaming response with attachment.
+    """
+    rows = queryset.order_by('pk').values_list(*fields).iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+    lines = csv_lines(rows, fields) if export_format == 'csv' else ndjson_lines(rows, fields)
+    response = StreamingHttpResponse(
+        batched(lines, settings.EXPORT_CHUNK_SIZE), content_type=EXPORT_CONTENT_TYPES[export_format],
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    return response
@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+FEED_KEY = 'manager_feed:{}'
+
+
+def feed_key(model) -> str:
+    """
+    Function for getting cache key with the newest request of the model.
+
+    :param model: UserReservation or ContactUs class.
+    :return: Cache key.
+    """
+    return FEED_KEY.format(model._meta.label_lower)
+
+
+def request_created(sender, instance, created, raw=False, **kwargs):
+    """
+    Receiver for post_save signal of reservations and contact applications.
+
+    Primary key of the newest request is put to the cache, so waiting managers are notified without
+    database queries.
+    """
+    if created and not raw:
+        cache.set(feed_key(sender), instance.pk, timeout=None)
+
+
+def rows_after(queryset, after: int, fields: tuple) -> list:
+    """
+    Function for getting unprocessed requests created after the cursor.
+
+    :param queryset: UserReservation or ContactUs queryset.
+    :param after: Primary key of the last known request.
+    :param fields: Fields of the rows.
+    :return: List of dictionaries ordered from the oldest.
+    """
+    rows = queryset.filter(pk__gt=after, is_processed=False).order_by('pk').values('pk', *fields)
+    return list(rows[:settings.MANAGER_PAGE_SIZE])
+
+
+def latest_pk(queryset) -> int:
+    """
+    Function for getting primary key of the newest request.
+
+    :param queryset: UserReservation or ContactUs queryset.
+    :return: Primary key or 0.
+    """
+    return queryset.order_by('-pk').values_list('pk', flat=True).first() or 0
+
+
+async def wait_for_rows(queryset, after: int, fields: tuple) -> tuple:
+    """
+    Function for waiting for new requests (long polling).
+
+    Cache stamp is checked every MANAGER_FEED_POLL_INTERVAL seconds, database is queried only when it has
+    changed and once at the end of MANAGER_FEED_TIMEOUT (stamp can be private for a worker with local
+    memory cache).
+
+    :param queryset: UserReservation or ContactUs queryset.
+    :param after: Primary key of the last known request.
+    :param fields: Fields of the rows.
+    :return: Tuple (new rows, cursor for the next call), rows list is empty on timeout.
+    """
+    key = feed_key(queryset.model)
+    deadline = time.monotonic() + settings.MANAGER_FEED_TIMEOUT
+    while time.monotonic() < deadline:
+        newest = await cache.aget(key)
+        if newest is not None and newest > after:
+            rows = await sync_to_async(rows_after)(queryset, after, fields)
+            if rows:
+                return rows, rows[-1]['pk']
+            after = newest
+        await asyncio.sleep(settings.MANAGER_FEED_POLL_INTERVAL)
+    rows = await sync_to_async(rows_after)(queryset, after, fields)
+    return rows, rows[-1]['pk'] if rows else after
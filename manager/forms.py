@@ -0,0 +1,148 @@
+from django import forms
+from django.db.models import Q
+
+
+class ReservationFilterForm(forms.Form):
+    """
+    Class for creating form of the reservations filter on the manager page.
+
+    All fields are optional, filled fields narrow down the list.
+    """
+
+    date_from = forms.DateField(required=False, widget=forms.DateInput(attrs={'type': 'date'}))
+    date_to = forms.DateField(required=False, widget=forms.DateInput(attrs={'type': 'date'}))
+    time_from = forms.TimeField(required=False, widget=forms.TimeInput(attrs={'type': 'time'}))
+    time_to = forms.TimeField(required=False, widget=forms.TimeInput(attrs={'type': 'time'}))
+
+    def lookups(self) -> dict:
+        """
+        Function for getting lookups of the filled fields.
+
+        :return: Dictionary with lookups and values.
+        """
+        if not self.is_valid():
+            return {}
+        lookups = {
+            'date_reservation__gte': self.cleaned_data['date_from'],
+            'date_reservation__lte': self.cleaned_data['date_to'],
+            'time_reservation__gte': self.cleaned_data['time_from'],
+            'time_reservation__lte': self.cleaned_data['time_to'],
+        }
+        return {lookup: value for lookup, value in lookups.items() if value is not None}
+
+    def filter(self, queryset):
+        """
+        Function for filtering reservations by date and time of the reservation.
+
+        :param queryset: UserReservation queryset.
+        :return: Filtered queryset.
+        """
+        return queryset.filter(**self.lookups())
+
+    def ordering(self) -> tuple:
+        """
+        Function for getting ordering of the list.
+
+        Filtered reservations are ordered by date and time, so the list is read from reservation_slot_idx,
+        other way the newest requests go first.
+
+        :return: Ordering fields.
+        """
+        if self.lookups():
+            return 'date_reservation', 'time_reservation', 'id'
+        return '-date_of_the_request', '-id'
+
+
+class ExportForm(forms.Form):
+    """
+    Class for creating form of the requests export on the manager pages.
+
+    export_format - csv or ndjson.\n
+    date_from - First date of the range (date of reservation or date of the request).\n
+    date_to - Last date of the range.\n
+    is_processed - Only processed, only not processed or all requests.\n
+    """
+
+    export_format = forms.ChoiceField(choices=(('csv', 'CSV'), ('ndjson', 'NDJSON')), initial='csv')
+    date_from = forms.DateField(required=False, widget=forms.DateInput(attrs={'type': 'date'}))
+    date_to = forms.DateField(required=False, widget=forms.DateInput(attrs={'type': 'date'}))
+    is_processed = forms.NullBooleanField(
+        required=False,
+        widget=forms.Select(choices=(('', 'All'), ('true', 'Processed'), ('false', 'Not processed'))),
+    )
+
+    def filter(self, queryset, date_field: str):
+        """
+        Function for filtering requests by date range and is_processed marker.
+
+        :param queryset: UserReservation or ContactUs queryset.
+        :param date_field: Lookup of the date, for example 'date_reservation'.
+        :return: Filtered queryset.
+        """
+        lookups = {
+            f'{date_field}__gte': self.cleaned_data['date_from'],
+            f'{date_field}__lte': self.cleaned_data['date_to'],
+            'is_processed': self.cleaned_data['is_processed'],
+        }
+        return queryset.filter(**{lookup: value for lookup, value in lookups.items() if value is not None})
+
+
+class IntegerListField(forms.Field):
+    """
+    Field for the list of integers from several inputs with the same name (checkboxes).
+    """
+    widget = forms.MultipleHiddenInput
+
+    def to_python(self, value) -> list:
+        if not value:
+            return []
+        try:
+            return [int(item) for item in value]
+        except (TypeError, ValueError):
+            raise forms.ValidationError('Enter a list of whole numbers.')
+
+
+class BulkCloseForm(forms.Form):
+    """
+    Class for creating form of closing several requests at once on the manager pages.
+
+    action - Which requests are closed: selected ones or all before the date (value of the pressed button).\n
+    pk - Primary keys of the selected requests.\n
+    before - All requests created before this date and time.\n
+    """
+
+    action = forms.ChoiceField(choices=(('selected', 'Selected requests'), ('before', 'Requests before the date')))
+    pk = IntegerListField(required=False)
+    before = forms.DateTimeField(
+        required=False,
+        input_formats=['%Y-%m-%dT%H:%M', '%Y-%m-%d %H:%M', '%Y-%m-%d'],
+        widget=forms.DateTimeInput(attrs={'type': 'datetime-local'}),
+    )
+
+    def clean(self):
+        """
+        Function checked that requests are selected or the date is filled, depending on the pressed button.
+
+        :return: Cleaned data or exception.
+        """
+        data = super().clean()
+        if data.get('action') == 'selected' and not data.get('pk'):
+            raise forms.ValidationError('Select requests.')
+        if data.get('action') == 'before' and not data.get('before'):
+            raise forms.ValidationError('Enter the date.')
+        return data
+
+    def close(self, queryset) -> int:
+        """
+        Function for marking selected requests (or requests before the date) as processed with one UPDATE query.
+
+        Only the condition of the pressed button is used, the other field is ignored.
+
+        :param queryset: UserReservation or ContactUs queryset.
+        :return: Number of closed requests.
+        """
+        if self.cleaned_data['action'] == 'selected':
+            condition = Q(pk__in=self.cleaned_data['pk'])
+        else:
+            condition = Q(date_of_the_request__lt=self.cleaned_data['before'])
+        return queryset.filter(condition, is_processed=False).update(is_processed=True)
@@ -0,0 +1,81 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+def encode_cursor(values: list) -> str:
+    """
+    Function for encoding values of the last row to the URL-safe cursor.
+
+    :param values: Values of the ordering fields.
+    :return: Cursor string.
+    """
+    data = json.dumps([str(value) for value in values]).encode()
+    return base64.urlsafe_b64encode(data).decode()
+
+
+def decode_cursor(queryset, fields: list, cursor: str):
+    """
+    Function for decoding cursor to the values of the ordering fields.
+
+    :param queryset: Queryset of the model.
+    :param fields: Names of the ordering fields.
+    :param cursor: Cursor string.
+    :return: List of values or None if cursor is broken.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if len(values) != len(fields):
+            return None
+        return [queryset.model._meta.get_field(field).to_python(value) for field, value in zip(fields, values)]
+    except (ValueError, TypeError, ValidationError, binascii.Error):
+        return None
+
+
+def after_cursor(fields: list, values: list, descending: bool) -> Q:
+    """
+    Function for building condition "row goes after the cursor" for the ordering.
+
+    (a, b) > (x, y) is written as a > x OR (a = x AND b > y), so the database can use index on (a, b).
+
+    :param fields: Names of the ordering fields.
+    :param values: Values of the cursor.
+    :param descending: Is ordering descending or not.
+    :return: Q object.
+    """
+    lookup = 'lt' if descending else 'gt'
+    condition = Q()
+    for index, field in enumerate(fields):
+        equal = {prev_field: value for prev_field, value in zip(fields[:index], values)}
+        condition |= Q(**equal, **{f'{field}__{lookup}': values[index]})
+    return condition
+
+
+def keyset_page(queryset, ordering: tuple, cursor: str, size: int) -> tuple:
+    """
+    Function for getting one page of the queryset with keyset (cursor) pagination.
+
+    Page cost does not depend on its number: rows are searched by the cursor, not skipped with OFFSET.
+    All ordering fields must have the same direction and the last one must be unique (primary key).
+
+    :param queryset: Queryset to paginate.
+    :param ordering: Ordering fields, for example ('-date_of_the_request', '-id').
+    :param cursor: Cursor from the previous page or None for the first page.
+    :param size: Number of rows on the page.
+    :return: Tuple (rows, cursor of the next page or None).
+    """
+    descending = ordering[0].startswith('-')
+    fields = [field.lstrip('-') for field in ordering]
+    queryset = queryset.order_by(*ordering)
+    values = decode_cursor(queryset, fields, cursor) if cursor else None
+    if values is not None:
+        queryset = queryset.filter(after_cursor(fields, values, descending))
+
+    rows = list(queryset[:size + 1])
+    if len(rows) <= size:
+        return rows, None
+    rows = rows[:size]
+    return rows, encode_cursor([getattr(rows[-1], field) for field in fields])
@@ -0,0 +1,7 @@
+from django.db.models.signals import post_save
+
+from main_page.models import UserReservation, ContactUs
+from .feed import request_created
+
+post_save.connect(request_created, sender=UserReservation, dispatch_uid='feed_reservation_created')
+post_save.connect(request_created, sender=ContactUs, dispatch_uid='feed_contact_created')
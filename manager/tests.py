@@ -1,3 +1,164 @@
-from django.test import TestCase
+import datetime
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.test import TestCase, override_settings
+
+from account.roles import MANAGER_ROLE
+from main_page.models import UserReservation, ContactUs
+from site_reva_a.testing import ViewBudgetMixin
+
+User = get_user_model()
+
+
+class ManagerTestCase(TestCase):
+    """
+    Test case with a logged in user from 'manager' group.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = User.objects.create_user(username='manager', password='secret-password')
+        cls.manager.groups.add(Group.objects.create(name=MANAGER_ROLE))
+
+    def setUp(self):
+        self.client.force_login(self.manager)
+
+    @staticmethod
+    def create_reservations(count, **fields):
+        return UserReservation.objects.bulk_create(
+            UserReservation(name=f'Guest {number}', email='guest@mail.com', phone='050 123 4567',
+                            date_reservation=datetime.date(2030, 1, 1) + datetime.timedelta(days=number % 30),
+                            time_reservation=datetime.time(12 + number % 8), persons=2, **fields)
+            for number in range(count)
+        )
+
+    @staticmethod
+    def create_contacts(count, **fields):
+        return ContactUs.objects.bulk_create(
+            ContactUs(name=f'Guest {number}', email='guest@mail.com', subject='Question', message='Hello', **fields)
+            for number in range(count)
+        )
+
+
+class ViewBudgetTest(ViewBudgetMixin, ManagerTestCase):
+    """
+    Manager lists stay within their budgets on every page.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.create_reservations(120)
+        cls.create_contacts(120)
+
+    def test_reservations_list(self):
+        response = self.assert_within_budget('/manager/reservations/', 'manager:reservations_list')
+        self.assert_within_budget(f"/manager/reservations/{response.context['next_page']}",
+                                  'manager:reservations_list')
+        self.assert_within_budget('/manager/reservations/?date_from=2030-01-05', 'manager:reservations_list')
+
+    def test_contact_list(self):
+        response = self.assert_within_budget('/manager/contact/', 'manager:contact_list')
+        self.assert_within_budget(f"/manager/contact/{response.context['next_page']}", 'manager:contact_list')
+
+
+class BulkCloseTest(ManagerTestCase):
+    """
+    Bulk close applies only the condition of the pressed button.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.old = self.create_reservations(3)
+        UserReservation.objects.update(date_of_the_request=datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc))
+        self.new = self.create_reservations(3)
+
+    def close(self, **data):
+        return self.client.post('/manager/reservations/close/', {'before': '2021-01-01T00:00', **data}, follow=True)
+
+    def open_pks(self):
+        return set(UserReservation.objects.filter(is_processed=False).values_list('pk', flat=True))
+
+    def test_close_selected(self):
+        response = self.close(action='selected', pk=[self.new[0].pk])
+        self.assertEqual(self.open_pks(), {item.pk for item in self.old + self.new[1:]})
+        self.assertContains(response, '1 reservations closed.')
+
+    def test_close_before(self):
+        response = self.close(action='before', pk=[self.new[0].pk])
+        self.assertEqual(self.open_pks(), {item.pk for item in self.new})
+        self.assertContains(response, '3 reservations closed.')
+
+    def test_nothing_selected(self):
+        response = self.close(action='selected')
+        self.assertEqual(len(self.open_pks()), 6)
+        self.assertContains(response, 'Select requests.')
+
+    def test_contacts(self):
+        contacts = self.create_contacts(2)
+        response = self.client.post('/manager/contact/close/', {'action': 'selected', 'pk': [contacts[0].pk]},
+                                    follow=True)
+        self.assertEqual(list(ContactUs.objects.filter(is_processed=False)), [contacts[1]])
+        self.assertContains(response, '1 contact applications closed.')
+
+
+class FeedTest(ManagerTestCase):
+    """
+    Long polling feed is served with ASGI server only (MANAGER_FEED_ENABLED is off under WSGI and in tests).
+    """
+
+    def test_feed_disabled(self):
+        self.assertNotContains(self.client.get('/manager/reservations/'), 'manager-feed.js')
+        self.assertNotContains(self.client.get('/manager/contact/'), 'manager-feed.js')
+        self.assertEqual(self.client.get('/manager/reservations/feed/').status_code, 404)
+
+
+@override_settings(MANAGER_PAGE_SIZE=7)
+class KeysetPaginationTest(ManagerTestCase):
+    """
+    Pages of the manager lists follow each other without gaps and repeats, also for equal ordering values.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.create_reservations(30)
+        cls.create_reservations(5, is_processed=True)
+        # Requests created at the same time are ordered by primary key.
+        UserReservation.objects.filter(pk__lte=10).update(
+            date_of_the_request=datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc),
+        )
+
+    def walk(self, path):
+        """
+        Function for reading all pages of the list.
+
+        :return: List of pages, every page is a list of objects.
+        """
+        pages = []
+        url = path
+        while url:
+            response = self.client.get(url)
+            pages.append(list(response.context['lst']))
+            next_page = response.context['next_page']
+            url = f'{path.split("?")[0]}{next_page}' if next_page else None
+        return pages
+
+    def test_newest_first(self):
+        pages = self.walk('/manager/reservations/')
+        self.assertEqual([len(page) for page in pages], [7, 7, 7, 7, 2])
+        expected = list(UserReservation.objects.filter(is_processed=False).order_by('-date_of_the_request', '-id'))
+        self.assertEqual(sum(pages, []), expected)
+
+    def test_filtered_by_date(self):
+        pages = self.walk('/manager/reservations/?date_from=2030-01-03&date_to=2030-01-20')
+        expected = list(UserReservation.objects.filter(
+            is_processed=False, date_reservation__range=(datetime.date(2030, 1, 3), datetime.date(2030, 1, 20)),
+        ).order_by('date_reservation', 'time_reservation', 'id'))
+        self.assertEqual(sum(pages, []), expected)
+        self.assertGreater(len(pages), 1)
+
+    def test_broken_cursor(self):
+        response = self.client.get('/manager/reservations/?after=broken')
+        self.assertEqual(list(response.context['lst']), self.walk('/manager/reservations/')[0])
@@ -1,12 +1,25 @@
+from django.conf import settings
 from django.urls import path
-from .views import reservation_list, update_reservation, contact_list, update_contact, manager_page
+from .views import reservation_list, update_reservation, close_reservations, contact_list, update_contact, \
+    close_contacts, reservations_feed, contacts_feed, export_reservations, export_contacts, manager_page
 
 app_name = 'manager'
 
 urlpatterns = [
     path('reservations/', reservation_list, name='reservations_list'),
     path('reservations/update/<int:pk>', update_reservation, name='update_reserve'),
+    path('reservations/close/', close_reservations, name='close_reservations'),
+    path('reservations/export/', export_reservations, name='export_reservations'),
     path('contact/', contact_list, name='contact_list'),
     path('contact/update/<int:pk>', update_contact, name='update_contact'),
+    path('contact/close/', close_contacts, name='close_contacts'),
+    path('contact/export/', export_contacts, name='export_contacts'),
     path('', manager_page, name='manager_page')
-]
\ No newline at end of file
+]
+
+# Long polling views hold the worker for the whole wait, they are served by ASGI server only.
+if settings.MANAGER_FEED_ENABLED:
+    urlpatterns += [
+        path('reservations/feed/', reservations_feed, name='reservations_feed'),
+        path('contact/feed/', contacts_feed, name='contacts_feed'),
+    ]
@@ -1,18 +1,37 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.http import JsonResponse, HttpResponseBadRequest
 from django.shortcuts import render, redirect
 from main_page.models import UserReservation, ContactUs
 from django.contrib.auth.decorators import login_required, user_passes_test
-from main_page.models import InformationInContactUs, Footer
+from account.roles import is_manager
+from django.views.decorators.http import require_POST, require_safe
+from .export import RESERVATION_EXPORT_FIELDS, CONTACT_EXPORT_FIELDS, export_response
+from .feed import latest_pk, wait_for_rows
+from .forms import ReservationFilterForm, BulkCloseForm, ExportForm
+from .pagination import keyset_page
 # Create your views here.
 
+# Columns rendered in the lists, other columns are not loaded.
+RESERVATION_LIST_FIELDS = ('name', 'phone', 'date_reservation', 'time_reservation', 'message', 'date_of_the_request',
+                           'is_waitlisted')
+CONTACT_LIST_FIELDS = ('name', 'email', 'subject', 'message', 'date_of_the_request')
 
-def is_manager(user):
+
+def next_page_url(request, cursor):
     """
-    Checked if user have group 'manager' in his group list.\n
-    
-    :param user: Session user unit.
-    :return: True or False.
+    Function for getting URL of the next page with the same GET parameters.
+
+    :param request: GET request.
+    :param cursor: Cursor of the next page or None.
+    :return: Query string or None if there is no next page.
     """
-    return user.groups.filter(name='manager').exists()
+    if cursor is None:
+        return None
+    params = request.GET.copy()
+    params['after'] = cursor
+    return f'?{params.urlencode()}'
 
 
 @login_required(login_url='login/')
@@ -22,8 +41,6 @@ def manager_page(request):
     View function of the manager page. Processed GET requests.
     Access guaranteed only for user's from 'manager' group.
 
-    information_in_contact_us - Object model InformationInContactUs.\n
-    footer - Footer object model.\n
     user_auth - Is user authenticated or not.\n
 
     :param request: GET request.
@@ -31,11 +48,7 @@ def manager_page(request):
     
     """
     user_auth = request.user.is_authenticated
-    information_in_contact_us = InformationInContactUs.objects.get()
-    footer = Footer.objects.get()
     return render(request, 'manager_main_page.html', context={
-        'information_in_contact_us': information_in_contact_us,
-        'footer': footer,
         'user_auth': user_auth,
     })
 
@@ -47,9 +60,12 @@ def reservation_list(request):
     View function of the reservation page. Processed GET requests.
     Access guaranteed only for user's from 'manager' group.
 
-    lst - User Reservation objects filtered by is_processed marker.\n
-    information_in_contact_us - Object model InformationInContactUs.\n
-    footer - Footer object model.\n
+    lst - Page of User Reservation objects filtered by is_processed marker and by date and time from the filter.\n
+    filter_form - Form of the date and time filter (GET parameters date_from, date_to, time_from, time_to).\n
+    next_page - URL of the next page (GET parameter after), None on the last page.\n
+    feed_enabled - Are new requests loaded by the live feed (MANAGER_FEED_ENABLED) or not.\n
+    close_form - Form of closing several requests at once.\n
+    export_form - Form of the export to file.\n
     user_auth - Is user authenticated or not.\n
 
     :param request: GET request.
@@ -57,13 +73,17 @@ def reservation_list(request):
 
     """
     user_auth = request.user.is_authenticated
-    lst = UserReservation.objects.filter(is_processed=False)
-    information_in_contact_us = InformationInContactUs.objects.get()
-    footer = Footer.objects.get()
+    filter_form = ReservationFilterForm(request.GET)
+    reservations = UserReservation.objects.filter(is_processed=False).only(*RESERVATION_LIST_FIELDS)
+    lst, cursor = keyset_page(filter_form.filter(reservations), filter_form.ordering(), request.GET.get('after'),
+                              settings.MANAGER_PAGE_SIZE)
     return render(request, 'reservations_list.html', context={
         'lst': lst,
-        'information_in_contact_us': information_in_contact_us,
-        'footer': footer,
+        'filter_form': filter_form,
+        'close_form': BulkCloseForm(),
+        'export_form': ExportForm(),
+        'next_page': next_page_url(request, cursor),
+        'feed_enabled': settings.MANAGER_FEED_ENABLED,
         'user_auth': user_auth,
     })
 
@@ -83,6 +103,26 @@ def update_reservation(request, pk):
     return redirect('manager:reservations_list')
 
 
+@login_required(login_url='/login/')
+@user_passes_test(is_manager)
+@require_POST
+def close_reservations(request):
+    """
+    Change is_processed status to True for several UserReservation objects with one query.
+    Access guaranteed only for user's from 'manager' group.
+
+    :param request: POST request with action (selected or before) and primary keys (pk) or date and time (before).
+    :return: Redirect to the reservations_list.
+    """
+    form = BulkCloseForm(request.POST)
+    if form.is_valid():
+        closed = form.close(UserReservation.objects.all())
+        messages.success(request, f'{closed} reservations closed.')
+    else:
+        messages.error(request, ' '.join(error for errors in form.errors.values() for error in errors))
+    return redirect('manager:reservations_list')
+
+
 @login_required(login_url='/login/')
 @user_passes_test(is_manager)
 def contact_list(request):
@@ -90,9 +130,11 @@ def contact_list(request):
     View function of the contact page. Processed GET requests.
     Access guaranteed only for user's from 'manager' group.
 
-    all_contacts - User ContactUs objects filtered by is_processed marker.\n
-    information_in_contact_us - Object model InformationInContactUs.\n
-    footer - Footer object model.\n
+    all_contacts - Page of User ContactUs objects filtered by is_processed marker.\n
+    next_page - URL of the next page (GET parameter after), None on the last page.\n
+    feed_enabled - Are new requests loaded by the live feed (MANAGER_FEED_ENABLED) or not.\n
+    close_form - Form of closing several requests at once.\n
+    export_form - Form of the export to file.\n
     user_auth - Is user authenticated or not.\n
 
     :param request: GET request.
@@ -100,13 +142,15 @@ def contact_list(request):
 
     """
     user_auth = request.user.is_authenticated
-    all_contacts = ContactUs.objects.filter(is_processed=False)
-    information_in_contact_us = InformationInContactUs.objects.get()
-    footer = Footer.objects.get()
+    contacts = ContactUs.objects.filter(is_processed=False).only(*CONTACT_LIST_FIELDS)
+    all_contacts, cursor = keyset_page(contacts, ('-date_of_the_request', '-id'), request.GET.get('after'),
+                                       settings.MANAGER_PAGE_SIZE)
     return render(request, 'contact_list.html', context={
         'all_contacts': all_contacts,
-        'information_in_contact_us': information_in_contact_us,
-        'footer': footer,
+        'close_form': BulkCloseForm(),
+        'export_form': ExportForm(),
+        'next_page': next_page_url(request, cursor),
+        'feed_enabled': settings.MANAGER_FEED_ENABLED,
         'user_auth': user_auth,
     })
 
@@ -124,3 +168,113 @@ def update_contact(request, pk):
     """
     ContactUs.objects.filter(pk=pk).update(is_processed=True)
     return redirect('manager:contact_list')
+
+
+@login_required(login_url='/login/')
+@user_passes_test(is_manager)
+@require_POST
+def close_contacts(request):
+    """
+    Change is_processed status to True for several ContactUs objects with one query.
+    Access guaranteed only for user's from 'manager' group.
+
+    :param request: POST request with action (selected or before) and primary keys (pk) or date and time (before).
+    :return: Redirect to the contact_list.
+    """
+    form = BulkCloseForm(request.POST)
+    if form.is_valid():
+        closed = form.close(ContactUs.objects.all())
+        messages.success(request, f'{closed} contact applications closed.')
+    else:
+        messages.error(request, ' '.join(error for errors in form.errors.values() for error in errors))
+    return redirect('manager:contact_list')
+
+
+@login_required(login_url='/login/')
+@user_passes_test(is_manager)
+@require_safe
+def export_reservations(request):
+    """
+    Export of UserReservation objects to CSV or NDJSON file, rows are streamed from the database.
+    Access guaranteed only for user's from 'manager' group.
+
+    :param request: GET request with export_format, date_from, date_to (date of reservation) and is_processed.
+    :return: Streaming response with file or 400 for wrong filter.
+    """
+    form = ExportForm(request.GET)
+    if not form.is_valid():
+        return HttpResponseBadRequest(form.errors.as_text())
+    queryset = form.filter(UserReservation.objects.all(), 'date_reservation')
+    return export_response(queryset, RESERVATION_EXPORT_FIELDS, form.cleaned_data['export_format'], 'reservations')
+
+
+@login_required(login_url='/login/')
+@user_passes_test(is_manager)
+@require_safe
+def export_contacts(request):
+    """
+    Export of ContactUs objects to CSV or NDJSON file, rows are streamed from the database.
+    Access guaranteed only for user's from 'manager' group.
+
+    :param request: GET request with export_format, date_from, date_to (date of the request) and is_processed.
+    :return: Streaming response with file or 400 for wrong filter.
+    """
+    form = ExportForm(request.GET)
+    if not form.is_valid():
+        return HttpResponseBadRequest(form.errors.as_text())
+    queryset = form.filter(ContactUs.objects.all(), 'date_of_the_request__date')
+    return export_response(queryset, CONTACT_EXPORT_FIELDS, form.cleaned_data['export_format'], 'contacts')
+
+
+def is_manager_request(request) -> bool:
+    """
+    Checked if request is sent by logged in user from 'manager' group.
+
+    :param request: Any request.
+    :return: True or False.
+    """
+    return request.user.is_authenticated and is_manager(request.user)
+
+
+async def requests_feed(request, queryset, fields: tuple):
+    """
+    Long polling response with new unprocessed requests.
+
+    Without GET parameter after returns cursor immediately, with it waits for requests created
+    after the cursor up to MANAGER_FEED_TIMEOUT seconds.
+
+    :param request: GET request.
+    :param queryset: UserReservation or ContactUs queryset.
+    :param fields: Fields of the rows.
+    :return: JSON with cursor (after) and new rows (items).
+    """
+    if not await sync_to_async(is_manager_request)(request):
+        return JsonResponse({'error': 'Access denied'}, status=403)
+    after = request.GET.get('after', '')
+    if not after.isdigit():
+        return JsonResponse({'after': await sync_to_async(latest_pk)(queryset), 'items': []})
+    rows, cursor = await wait_for_rows(queryset, int(after), fields)
+    return JsonResponse({'after': cursor, 'items': rows})
+
+
+async def reservations_feed(request):
+    """
+    Async view function of the live feed of new reservations, served with ASGI server (MANAGER_FEED_ENABLED).
+    Access guaranteed only for user's from 'manager' group.
+
+    :param request: GET request.
+    :return: JSON with new reservations.
+    """
+    return await requests_feed(request, UserReservation.objects.all(), RESERVATION_LIST_FIELDS)
+
+
+async def contacts_feed(request):
+    """
+    Async view function of the live feed of new contact applications, served with ASGI server
+    (MANAGER_FEED_ENABLED).
+    Access guaranteed only for user's from 'manager' group.
+
+    :param request: GET request.
+    :return: JSON with new contact applications.
+    """
+    return await requests_feed(request, ContactUs.objects.all(), CONTACT_LIST_FIELDS)
@@ -0,0 +1,120 @@
+import mimetypes
+import os
+import re
+import stat
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+
+# Uploaded files get unique uuid-names and never change, so they can be cached forever.
+CACHE_CONTROL = 'public, max-age=31536000, immutable'
+CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def parse_range(header: str, size: int):
+    """
+    Function for parsing single byte range from the Range header.
+
+    Multiple ranges are not supported, whole file is sent for them.
+
+    :param header: Value of the Range header.
+    :param size: Size of the file.
+    :return: Tuple (start, end) with inclusive end, None if header is not usable or False if range is unsatisfiable.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    start, end = match.groups()
+    if not start:
+        length = int(end)
+        if not length:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def read_range(file, start: int, length: int):
+    """
+    Generator for reading part of the file by chunks.
+
+    :param file: Opened file.
+    :param start: First byte.
+    :param length: Number of bytes.
+    """
+    try:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    View function for serving uploaded files in production. Processed GET and HEAD requests.
+
+    Whole files are sent with FileResponse, so WSGI server can use sendfile. Conditional requests
+    (ETag, Last-Modified) and single byte ranges are supported.
+
+    :param request: GET or HEAD request.
+    :param path: Path of the file inside MEDIA_ROOT.
+    :return: File response, 304, 206 or 416 response.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        file_stat = os.stat(full_path)
+    except (SuspiciousFileOperation, OSError, ValueError):
+        raise Http404('File not found')
+    if not stat.S_ISREG(file_stat.st_mode):
+        raise Http404('File not found')
+
+    size = file_stat.st_size
+    etag = f'"{size:x}-{int(file_stat.st_mtime):x}"'
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(file_stat.st_mtime),
+        'Cache-Control': CACHE_CONTROL,
+        'Accept-Ranges': 'bytes',
+    }
+    response = get_conditional_response(request, etag=etag, last_modified=int(file_stat.st_mtime))
+    if response is not None:
+        for header, value in headers.items():
+            response[header] = value
+        return response
+
+    content_type = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+    byte_range = None
+    if 'HTTP_RANGE' in request.META and request.META.get('HTTP_IF_RANGE', etag) == etag:
+        byte_range = parse_range(request.META['HTTP_RANGE'], size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416, headers=headers)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    if byte_range is None:
+        return FileResponse(open(full_path, 'rb'), content_type=content_type, headers=headers)
+
+    start, end = byte_range
+    length = end - start + 1
+    response = StreamingHttpResponse(
+        read_range(open(full_path, 'rb'), start, length), status=206, content_type=content_type, headers=headers,
+    )
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Length'] = str(length)
+    return response
@@ -0,0 +1,353 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import time
+from collections import deque
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.utils import CursorWrapper
+from django.template.base import Template
+from django.utils.cache import patch_vary_headers
+from whitenoise.base import MissingFileError
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from main_page.prerender import page_path
+
+logger = logging.getLogger(__name__)
+
+# Ring buffer with metrics of the latest requests.
+REQUEST_METRICS = deque(maxlen=settings.REQUEST_METRICS_BUFFER_SIZE)
+
+current_metrics = contextvars.ContextVar('current_metrics', default=None)
+
+# Budget metrics raised in strict mode, they are the same on every run.
+STRICT_BUDGET_METRICS = {'queries'}
+
+
+class BudgetExceeded(Exception):
+    """
+    Raised when view exceeded its query budget and REQUEST_METRICS_STRICT is on (in tests).
+    """
+
+
+class RequestMetrics:
+    """
+    Metrics of one request.
+
+    view - Name of the resolved view.\n
+    queries - Number of SQL queries.\n
+    sql_ms - Total time of SQL queries.\n
+    connections - Number of database connections opened by the request (0 when persistent ones are reused).\n
+    connect_ms - Time of opening the connections.\n
+    template_ms - Time of the template rendering.\n
+    total_ms - Wall time of the request.\n
+    """
+
+    def __init__(self):
+        self.view = None
+        self.queries = 0
+        self.sql_ms = 0.0
+        self.connections = 0
+        self.connect_ms = 0.0
+        self.template_ms = 0.0
+        self.total_ms = 0.0
+        self.template_depth = 0
+
+    def record_query(self, execute, sql, params, many, context):
+        """
+        Database execute wrapper, counts queries and their time.
+        """
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_ms += (time.perf_counter() - start) * 1000
+
+    def as_dict(self) -> dict:
+        return {
+            'view': self.view,
+            'queries': self.queries,
+            'sql_ms': round(self.sql_ms, 2),
+            'connections': self.connections,
+            'connect_ms': round(self.connect_ms, 2),
+            'template_ms': round(self.template_ms, 2),
+            'total_ms': round(self.total_ms, 2),
+        }
+
+    def server_timing(self) -> str:
+        """
+        Function for getting value of the Server-Timing header.
+
+        :return: Header value.
+        """
+        return (f'db;dur={self.sql_ms:.2f};desc="{self.queries} queries", '
+                f'conn;dur={self.connect_ms:.2f};desc="{self.connections} opened", tpl;dur={self.template_ms:.2f}, total;dur={self.total_ms:.2f}')
+
+
+def instrument_queries():
+    """
+    Function for wrapping CursorWrapper._execute_with_wrappers, so queries of the request are counted.
+
+    Metrics are taken from the context variable, so queries of sync_to_async threads (async views) are
+    counted too, the execute wrappers of the connection are set for one thread only.
+    """
+    execute_with_wrappers = CursorWrapper._execute_with_wrappers
+    if getattr(execute_with_wrappers, 'instrumented', False):
+        return
+
+    def instrumented_execute_with_wrappers(self, sql, params, many, executor):
+        metrics = current_metrics.get()
+        if metrics is not None:
+            executor = functools.partial(metrics.record_query, executor)
+        return execute_with_wrappers(self, sql, params, many, executor)
+
+    instrumented_execute_with_wrappers.instrumented = True
+    CursorWrapper._execute_with_wrappers = instrumented_execute_with_wrappers
+
+
+def instrument_templates():
+    """
+    Function for wrapping Template.render, so the time of the outermost template is recorded.
+
+    Included templates are rendered inside of the outermost one and are not counted twice.
+    """
+    render = Template.render
+    if getattr(render, 'instrumented', False):
+        return
+
+    def instrumented_render(self, context):
+        metrics = current_metrics.get()
+        if metrics is None:
+            return render(self, context)
+        metrics.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            metrics.template_depth -= 1
+            if not metrics.template_depth:
+                metrics.template_ms += (time.perf_counter() - start) * 1000
+
+    instrumented_render.instrumented = True
+    Template.render = instrumented_render
+
+
+def instrument_connections():
+    """
+    Function for wrapping BaseDatabaseWrapper.connect, so the time of opening database connections is recorded.
+
+    With persistent connections (DATABASE_CONN_MAX_AGE) it is spent only by the first request of the thread
+    and after the connection is found broken by the health check.
+    """
+    connect = BaseDatabaseWrapper.connect
+    if getattr(connect, 'instrumented', False):
+        return
+
+    def instrumented_connect(self):
+        metrics = current_metrics.get()
+        if metrics is None:
+            return connect(self)
+        start = time.perf_counter()
+        try:
+            return connect(self)
+        finally:
+            metrics.connections += 1
+            metrics.connect_ms += (time.perf_counter() - start) * 1000
+
+    instrumented_connect.instrumented = True
+    BaseDatabaseWrapper.connect = instrumented_connect
+
+
+def recent_metrics() -> list:
+    """
+    Function for getting metrics of the latest requests.
+
+    :return: List of dictionaries, the oldest first.
+    """
+    return list(REQUEST_METRICS)
+
+
+def check_budget(metrics: RequestMetrics) -> None:
+    """
+    Function for comparing request metrics with budget of the view from REQUEST_METRICS_BUDGETS.
+
+    Exceeded budget is logged, in strict mode exception is raised for the query count only: times depend
+    on the machine.
+
+    :param metrics: Metrics of the finished request.
+    """
+    budget = settings.REQUEST_METRICS_BUDGETS.get(metrics.view)
+    if not budget:
+        return
+    values = metrics.as_dict()
+    exceeded = {name: values[name] for name, limit in budget.items() if values[name] > limit}
+    if not exceeded:
+        return
+    message = f'View {metrics.view} exceeded budget {budget}: {exceeded}'
+    if settings.REQUEST_METRICS_STRICT and exceeded.keys() & STRICT_BUDGET_METRICS:
+        raise BudgetExceeded(message)
+    logger.warning(message)
+
+
+def async_check(middleware) -> None:
+    """
+    Function for turning the middleware to async mode when the next handler is async (as Django MiddlewareMixin
+    does), so under ASGI server the request doesn't hold a thread while the async view waits.
+
+    :param middleware: Middleware with get_response and async __acall__.
+    """
+    if asyncio.iscoroutinefunction(middleware.get_response):
+        middleware._is_coroutine = asyncio.coroutines._is_coroutine
+    else:
+        middleware._is_coroutine = None
+
+
+def show_server_timing(request) -> bool:
+    """
+    Function for checking that Server-Timing header can be sent, query counts and SQL time are shown
+    in DEBUG mode and to staff users only.
+
+    :param request: Any request.
+    :return: True or False.
+    """
+    if settings.DEBUG:
+        return True
+    user = getattr(request, 'user', None)
+    return user is not None and user.is_staff
+
+
+class RequestMetricsMiddleware:
+    """
+    Middleware that records query count, SQL time, connection time, template time and wall time
+    of every resolved view.
+
+    Metrics are written to the ring buffer and to the Server-Timing header of the response (DEBUG mode
+    and staff users). Enabled with REQUEST_METRICS environment variable and in tests.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        async_check(self)
+        instrument_queries()
+        instrument_templates()
+        instrument_connections()
+
+    def __call__(self, request):
+        if self._is_coroutine:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.process_metrics(request, response, metrics, start)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.process_metrics(request, response, metrics, start)
+
+    @staticmethod
+    def process_metrics(request, response, metrics: RequestMetrics, start: float):
+        """
+        Function for saving metrics of the finished request and checking its budget.
+
+        :param request: Any request.
+        :param response: Response of the view.
+        :param metrics: Metrics of the request.
+        :param start: perf_counter() value at the start of the request.
+        :return: Response.
+        """
+        metrics.total_ms = (time.perf_counter() - start) * 1000
+
+        if request.resolver_match is None:
+            return response
+        metrics.view = request.resolver_match.view_name
+        if show_server_timing(request):
+            response['Server-Timing'] = metrics.server_timing()
+        REQUEST_METRICS.append(metrics.as_dict())
+        check_budget(metrics)
+        return response
+
+
+class PrerenderedPageMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise middleware that also serves the pre-rendered main page (main_page/prerender.py).
+
+    The page is sent only for GET and HEAD requests without session cookie, so logged in users and
+    forms go to the view. The file is rebuilt while the server works, so it is looked up on every request
+    instead of the startup file list; gzip and Brotli variants are chosen by WhiteNoise. Under ASGI server
+    files are looked up in a thread and the async views are awaited.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        async_check(self)
+
+    def __call__(self, request):
+        if self._is_coroutine:
+            return self.__acall__(request)
+        response = self.static_response(request)
+        if response is None:
+            response = self.get_response(request)
+        return response
+
+    async def __acall__(self, request):
+        response = await sync_to_async(self.static_response, thread_sensitive=False)(request)
+        if response is None:
+            response = await self.get_response(request)
+        return response
+
+    def static_response(self, request):
+        """
+        Function for serving the pre-rendered page or a static file.
+
+        :param request: Any request.
+        :return: File response or None if the request goes to the view.
+        """
+        if (settings.PRERENDER_PAGE and request.path_info == '/' and request.method in ('GET', 'HEAD')
+                and settings.SESSION_COOKIE_NAME not in request.COOKIES):
+            response = self.prerendered_response(request)
+            if response is not None:
+                return response
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return None
+
+    def prerendered_response(self, request):
+        """
+        Function for serving the pre-rendered main page.
+
+        :param request: GET or HEAD request of the main page without session cookie.
+        :return: File response or None if there is no page.
+        """
+        try:
+            response = self.serve(self.get_static_file(page_path(), '/'), request)
+        except (MissingFileError, FileNotFoundError):
+            # Page was deleted by a content change before or after it was found.
+            return None
+        # Browser must not show the anonymous page after login.
+        response['Cache-Control'] = 'no-cache'
+        patch_vary_headers(response, ('Cookie', ))
+        return response
@@ -0,0 +1,60 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+PRIMARY_PIN_KEY = 'replica_reads_paused'
+
+# Reads are sent to replicas only inside replica_reads(), everything else stays on the primary.
+use_replica = ContextVar('use_replica', default=False)
+
+
+def pin_primary() -> None:
+    """
+    Function for reading content from the primary until replicas catch up with the change (REPLICA_LAG),
+    so pages cached under the new content version are not rendered from stale rows.
+    """
+    if settings.REPLICA_DATABASES:
+        cache.set(PRIMARY_PIN_KEY, True, timeout=settings.REPLICA_LAG)
+
+
+@contextmanager
+def replica_reads():
+    """
+    Context manager (or decorator) for the code that only reads public content.
+
+    Usage: with replica_reads(): ...
+
+    Works in threads started with sync_to_async, context variables are copied to them.
+    """
+    enabled = bool(settings.REPLICA_DATABASES) and not cache.get(PRIMARY_PIN_KEY)
+    token = use_replica.set(enabled)
+    try:
+        yield
+    finally:
+        use_replica.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Class of the database router that sends reads of REPLICA_APPS models to a random replica
+    inside replica_reads(). Writes, migrations and reads of other apps (auth, sessions) go to the primary.
+
+    """
+
+    def db_for_read(self, model, **hints):
+        if use_replica.get() and model._meta.app_label in settings.REPLICA_APPS:
+            return random.choice(settings.REPLICA_DATABASES)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas have the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
@@ -38,7 +38,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "site_reva_a.middleware.PrerenderedPageMiddleware",
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -47,6 +47,57 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Number of requests on one page of the manager lists.
+MANAGER_PAGE_SIZE = int(os.getenv("MANAGER_PAGE_SIZE", 50))
+
+# Number of rows read from the database at once by the manager export (manager/export.py).
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 2000))
+
+# Application is served by ASGI server (site_reva_a/asgi.py with uvicorn workers, see gunicorn.conf.py).
+ASGI_SERVER = os.getenv("ASGI_SERVER", "False") == "True"
+
+# Long polling of new requests on the manager pages (manager/feed.py), in seconds. It is on with ASGI server
+# only: under WSGI every open manager page would hold a worker thread for the whole wait.
+MANAGER_FEED_ENABLED = os.getenv("MANAGER_FEED_ENABLED", str(ASGI_SERVER)) == "True"
+MANAGER_FEED_TIMEOUT = int(os.getenv("MANAGER_FEED_TIMEOUT", 20))
+MANAGER_FEED_POLL_INTERVAL = float(os.getenv("MANAGER_FEED_POLL_INTERVAL", 1))
+
+# Static main page for anonymous visitors (python manage.py prerender_main_page), served by
+# PrerenderedPageMiddleware and rebuilt PRERENDER_DELAY seconds after the last committed content change.
+# When the nearest event starts it is rebuilt by prerender_main_page --expired, run it from cron every minute.
+PRERENDER_PAGE = os.getenv("PRERENDER_PAGE", "False") == "True"
+PRERENDER_ROOT = os.getenv("PRERENDER_ROOT", os.path.join(BASE_DIR, "prerendered"))
+PRERENDER_DELAY = int(os.getenv("PRERENDER_DELAY", 5))
+
+# Reservation slots (main_page/slots.py): length in minutes, opening hours and seats of slots without
+# SlotCapacity. Requests for full slots are waitlisted when RESERVATION_WAITLIST is on, otherwise rejected.
+RESERVATION_SLOT_MINUTES = int(os.getenv("RESERVATION_SLOT_MINUTES", 30))
+RESERVATION_OPENING_TIME = os.getenv("RESERVATION_OPENING_TIME", "11:00")
+RESERVATION_CLOSING_TIME = os.getenv("RESERVATION_CLOSING_TIME", "23:00")
+RESERVATION_DEFAULT_SEATS = int(os.getenv("RESERVATION_DEFAULT_SEATS", 40))
+RESERVATION_WAITLIST = os.getenv("RESERVATION_WAITLIST", "True") == "True"
+
+# Tests are run (python manage.py test).
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'
+
+# Per-request query and latency metrics, see site_reva_a/middleware.py. Server-Timing header is sent
+# in DEBUG mode and to staff users only. Budgets are keyed by view name, exceeded budget is logged,
+# in strict mode exceeded query count is raised (total_ms is only logged). Both are always on in tests.
+REQUEST_METRICS = os.getenv("REQUEST_METRICS", "False") == "True" or TESTING
+REQUEST_METRICS_BUFFER_SIZE = int(os.getenv("REQUEST_METRICS_BUFFER_SIZE", 1000))
+REQUEST_METRICS_STRICT = os.getenv("REQUEST_METRICS_STRICT", "False") == "True" or TESTING
+REQUEST_METRICS_BUDGETS = {
+    'main_page': {'queries': 15, 'total_ms': 500},
+    # Successful login creates the session and updates last_login (with savepoints in tests).
+    'login_view': {'queries': 10, 'total_ms': 500},
+    'registration_view': {'queries': 6, 'total_ms': 500},
+    'manager:reservations_list': {'queries': 8, 'total_ms': 500},
+    'manager:contact_list': {'queries': 8, 'total_ms': 500},
+}
+
+if REQUEST_METRICS:
+    MIDDLEWARE.insert(0, 'site_reva_a.middleware.RequestMetricsMiddleware')
+
 ROOT_URLCONF = 'site_reva_a.urls'
 
 TEMPLATES = [
@@ -60,6 +111,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'main_page.context_processors.site_content',
             ],
         },
     },
@@ -67,24 +119,89 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'site_reva_a.wsgi.application'
 
+# Serve the main page with the async view (main_page.views.main_page_async), use it with ASGI server only.
+# All middleware is async-capable, so the request holds no thread while the sections are loaded.
+ASYNC_MAIN_PAGE = os.getenv("ASYNC_MAIN_PAGE", "False") == "True"
+
 
 # Database
 # https://docs.djangoproject.com/en/3.1/ref/settings/#databases
 DEVELOPMENT_MODE = os.getenv("DEVELOPMENT_MODE", "False") == "True"
 
+# Read-only copies of the primary database, comma separated URLs. Public pages read content
+# of REPLICA_APPS from them (site_reva_a/routers.py), writes, auth and manager pages use the primary.
+REPLICA_DATABASES = []
+REPLICA_APPS = ('main_page', )
+# Seconds after a content change while pages are still read from the primary.
+REPLICA_LAG = int(os.getenv("REPLICA_LAG", 5))
+
+# Every worker thread keeps its connection for DATABASE_CONN_MAX_AGE seconds (0 - close after each request),
+# the connection is checked before it is reused by the next request. With sync workers number of connections
+# is workers * threads of gunicorn (gunicorn.conf.py). ASGI server opens connections in executor threads
+# (async views, sections of ASYNC_MAIN_PAGE) that are not bounded by it, so they are closed by default.
+DATABASE_CONN_MAX_AGE = int(os.getenv("DATABASE_CONN_MAX_AGE", 0 if ASGI_SERVER else 600))
+DATABASE_CONN_HEALTH_CHECKS = os.getenv("DATABASE_CONN_HEALTH_CHECKS", "True") == "True"
+
 if DEVELOPMENT_MODE is True:
     DATABASES = {
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": os.path.join(BASE_DIR, "db.sqlite3"),
+            "CONN_MAX_AGE": DATABASE_CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": DATABASE_CONN_HEALTH_CHECKS,
         }
     }
 elif len(sys.argv) > 0 and sys.argv[1] != 'collectstatic':
     if os.getenv("DATABASE_URL", None) is None:
         raise Exception("DATABASE_URL environment variable not defined")
     DATABASES = {
-        "default": dj_database_url.parse(os.environ.get("DATABASE_URL")),
+        "default": dj_database_url.parse(os.environ.get("DATABASE_URL"), conn_max_age=DATABASE_CONN_MAX_AGE,
+                                         conn_health_checks=DATABASE_CONN_HEALTH_CHECKS),
+    }
+    for index, url in enumerate(filter(None, os.getenv("DATABASE_REPLICA_URLS", "").split(","))):
+        DATABASES[f"replica_{index}"] = {
+            **dj_database_url.parse(url.strip(), conn_max_age=DATABASE_CONN_MAX_AGE,
+                                    conn_health_checks=DATABASE_CONN_HEALTH_CHECKS),
+            "TEST": {"MIRROR": "default"},
+        }
+        REPLICA_DATABASES.append(f"replica_{index}")
+
+DATABASE_ROUTERS = ['site_reva_a.routers.ReplicaRouter'] if REPLICA_DATABASES else []
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+# Local memory cache is private for every worker, set shared backend (file based, memcached, redis) in
+# production, so changes in admin section invalidate cached pages in all workers.
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache")
+# Cache is seen by all workers. Sessions, session users and roles are kept long in the cache only then:
+# a logout or a changed user clears the cache of one worker.
+SHARED_CACHE = CACHE_BACKEND != "django.core.cache.backends.locmem.LocMemCache"
+
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
     }
+}
+
+# Time to live of the cached main page for anonymous users, in seconds.
+MAIN_PAGE_CACHE_TIMEOUT = int(os.getenv("MAIN_PAGE_CACHE_TIMEOUT", 60 * 60))
+
+# Time to live of the cached user groups (account/roles.py), they are also dropped when membership changes.
+# Without shared cache other workers see the change only after the timeout, so it is short.
+ROLE_CACHE_TIMEOUT = int(os.getenv("ROLE_CACHE_TIMEOUT", 60 * 60 * 24 if SHARED_CACHE else 60))
+
+# With shared cache sessions are read from the cache and written to the database only when they are changed,
+# expired rows are deleted with python manage.py purge_sessions.
+SESSION_ENGINE = os.getenv("SESSION_ENGINE", "django.contrib.sessions.backends.cached_db" if SHARED_CACHE
+                           else "django.contrib.sessions.backends.db")
+SESSION_PURGE_BATCH_SIZE = int(os.getenv("SESSION_PURGE_BATCH_SIZE", 1000))
+
+# Session user is taken from the cache too (account/backends.py), 0 - from the database on every request.
+AUTHENTICATION_BACKENDS = ['account.backends.CachedModelBackend']
+USER_CACHE_TIMEOUT = int(os.getenv("USER_CACHE_TIMEOUT", 60 * 5 if SHARED_CACHE else 0))
 
 
 # Password validation
@@ -130,9 +247,71 @@ STATICFILES_DIRS = (
     os.path.join(BASE_DIR, 'static'),
 )
 
+# Collected files get content hashes in names and gzip/Brotli copies, so browsers cache them forever
+# (site_reva_a/storage.py).
+if not DEVELOPMENT_MODE:
+    STATICFILES_STORAGE = 'site_reva_a.storage.CompressedManifestStorage'
+
+# Bundles of the base templates built by python manage.py build_assets (main_page/assets.py) before
+# collectstatic. Rules for ASSET_CRITICAL_SELECTORS are inlined by {% critical_css %}.
+USE_ASSET_BUNDLES = os.getenv("USE_ASSET_BUNDLES", "False") == "True"
+ASSET_BUNDLE_DIR = 'assets/bundles'
+ASSET_BUILD_ROOT = os.path.join(BASE_DIR, 'static', *ASSET_BUNDLE_DIR.split('/'))
+# Icon fonts with only the icons used in ICON_SCAN_DIRS (python manage.py subset_icons, main_page/icons.py),
+# their trimmed stylesheets replace the original ones when USE_ICON_SUBSETS is on.
+USE_ICON_SUBSETS = os.getenv("USE_ICON_SUBSETS", "False") == "True"
+ICON_SUBSET_DIR = 'assets/icons'
+ICON_BUILD_ROOT = os.path.join(BASE_DIR, 'static', *ICON_SUBSET_DIR.split('/'))
+ICON_FONTS = {
+    'bootstrap-icons': ('assets/vendor/bootstrap-icons/bootstrap-icons.css',
+                        'assets/vendor/bootstrap-icons/fonts/bootstrap-icons.woff'),
+    'boxicons': ('assets/vendor/boxicons/css/boxicons.min.css', 'assets/vendor/boxicons/fonts/boxicons.woff'),
+}
+ICON_SCAN_DIRS = (
+    os.path.join(BASE_DIR, 'templates'),
+    os.path.join(BASE_DIR, 'main_page', 'templates'),
+    os.path.join(BASE_DIR, 'manager', 'templates'),
+    os.path.join(BASE_DIR, 'account', 'templates'),
+    os.path.join(BASE_DIR, 'static', 'assets', 'js'),
+)
+# Icons used outside of the scanned files, for example in HTML fields of the models.
+ICON_EXTRA_CLASSES = tuple(filter(None, os.getenv("ICON_EXTRA_CLASSES", "").split(",")))
+ICON_CSS = (f'{ICON_SUBSET_DIR}/bootstrap-icons.css', f'{ICON_SUBSET_DIR}/boxicons.css') if USE_ICON_SUBSETS else (
+    'assets/vendor/bootstrap-icons/bootstrap-icons.css', 'assets/vendor/boxicons/css/boxicons.min.css',
+)
+
+ASSET_BUNDLES = {
+    'site.css': (
+        'assets/vendor/animate.css/animate.min.css',
+        'assets/vendor/bootstrap/css/bootstrap.min.css',
+        *ICON_CSS,
+        'assets/vendor/glightbox/css/glightbox.min.css',
+        'assets/vendor/swiper/swiper-bundle.min.css',
+        'assets/css/style.css',
+    ),
+    'site.js': (
+        'assets/vendor/bootstrap/js/bootstrap.bundle.min.js',
+        'assets/vendor/glightbox/js/glightbox.min.js',
+        'assets/vendor/isotope-layout/isotope.pkgd.min.js',
+        'assets/vendor/swiper/swiper-bundle.min.js',
+        'assets/js/main.js',
+    ),
+}
+ASSET_CRITICAL_SELECTORS = (
+    ':root', '*', 'html', 'body', 'a', 'h1', 'h2', 'p', 'ul', 'li', 'section',
+    '#topbar', '#header', '#navbar', '.navbar', '.logo', '.book-a-table-btn', '.mobile-nav-toggle',
+    '#hero', '.hero-', '.carousel', '.carousel-', '.btn-menu', '.btn-book',
+    '.container', '.container-', '.fixed-top', '.d-flex', '.d-none', '.d-lg-flex', '.align-items-center',
+    '.justify-content-', '.me-auto', '.ms-4', '.order-',
+)
+
 MEDIA_URL = 'media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media/')
 
+# Widths (ascending) and quality of the responsive copies of the uploaded images, see main_page/images.py.
+IMAGE_DERIVATIVE_WIDTHS = (320, 640, 960, 1280, 1920)
+IMAGE_DERIVATIVE_QUALITY = 80
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.1/ref/settings/#default-auto-field
@@ -0,0 +1,24 @@
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+class CompressedManifestStorage(CompressedManifestStaticFilesStorage):
+    """
+    Class of the static files storage with hashed names and compressed copies that keeps references
+    to missing source maps as they are.
+
+    Vendor scripts are shipped without some of their source maps (swiper), the post-processing
+    fails on them otherwise. Other missing files still fail it.
+    """
+
+    def url_converter(self, name, hashed_files, template=None):
+        converter = super().url_converter(name, hashed_files, template)
+
+        def source_map_converter(matchobj):
+            try:
+                return converter(matchobj)
+            except ValueError:
+                if 'sourceMappingURL' not in matchobj.group(0):
+                    raise
+                return matchobj.group(0)
+
+        return source_map_converter
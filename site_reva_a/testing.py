@@ -0,0 +1,20 @@
+from site_reva_a.middleware import recent_metrics
+
+
+class ViewBudgetMixin:
+    """
+    Mixin of the test cases for pages with REQUEST_METRICS_BUDGETS, exceeded query budget is raised in tests.
+    """
+
+    def assert_within_budget(self, path: str, view: str):
+        """
+        Function for requesting the page and checking that its budget was checked.
+
+        :param path: URL of the page.
+        :param view: Name of the view in REQUEST_METRICS_BUDGETS.
+        :return: Response.
+        """
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(recent_metrics()[-1]['view'], view)
+        return response
@@ -0,0 +1,79 @@
+import tempfile
+
+from asgiref.sync import AsyncToSync, SyncToAsync
+from django.core.files.base import ContentFile
+from django.core.handlers.asgi import ASGIHandler
+from django.test import TestCase, override_settings
+
+from .middleware import BudgetExceeded, RequestMetrics, check_budget, recent_metrics
+from .storage import CompressedManifestStorage
+
+
+def middleware_chain(handler):
+    """
+    Function for walking the middleware chain of the handler.
+
+    :param handler: First handler of the chain.
+    :return: Generator of the handlers, middleware instances and adapters.
+    """
+    while handler is not None:
+        yield handler
+        handler = (getattr(handler, '__wrapped__', None) or getattr(handler, 'get_response', None)
+                   or getattr(handler, 'awaitable', None) or getattr(handler, 'func', None))
+
+
+class AsyncMiddlewareTest(TestCase):
+    """
+    Under ASGI server requests go through the middleware without a thread, so async views don't hold one.
+    """
+
+    def test_no_sync_adapters(self):
+        handlers = list(middleware_chain(ASGIHandler()._middleware_chain))
+        self.assertGreater(len(handlers), 1)
+        self.assertFalse([handler for handler in handlers if isinstance(handler, (AsyncToSync, SyncToAsync))])
+
+    async def test_metrics_recorded(self):
+        response = await self.async_client.get('/login/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(recent_metrics()[-1]['view'], 'login_view')
+
+
+@override_settings(REQUEST_METRICS_STRICT=True, REQUEST_METRICS_BUDGETS={'main_page': {'queries': 2, 'total_ms': 10}})
+class BudgetTest(TestCase):
+    """
+    Strict mode raises exceeded query count only, exceeded time is logged.
+    """
+
+    def metrics(self, queries, total_ms):
+        metrics = RequestMetrics()
+        metrics.view, metrics.queries, metrics.total_ms = 'main_page', queries, total_ms
+        return metrics
+
+    def test_slow_request_logged(self):
+        with self.assertLogs('site_reva_a.middleware', 'WARNING'):
+            check_budget(self.metrics(2, 50))
+
+    def test_queries_raised(self):
+        with self.assertRaises(BudgetExceeded):
+            check_budget(self.metrics(3, 1))
+
+
+class StaticFilesStorageTest(TestCase):
+    """
+    Collected scripts with references to missing source maps are hashed, other missing files fail.
+    """
+
+    def post_process(self, name, content):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        storage = CompressedManifestStorage(location=root.name, base_url='/static/')
+        storage.save(name, ContentFile(content))
+        return [processed for original, hashed, processed in storage.post_process({name: (storage, name)})]
+
+    def test_missing_source_map(self):
+        processed = self.post_process('vendor.js', b'var a = 1;\n//# sourceMappingURL=vendor.js.map\n')
+        self.assertFalse([result for result in processed if isinstance(result, Exception)])
+
+    def test_missing_file(self):
+        processed = self.post_process('site.css', b'body { background: url("missing.png"); }')
+        self.assertTrue([result for result in processed if isinstance(result, ValueError)])
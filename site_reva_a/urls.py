@@ -15,9 +15,9 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from main_page.views import main_page
+from main_page.views import main_page, main_page_async, reservation_slots, csrf_token
+from .media import serve_media
 from django.conf import settings
-from django.conf.urls.static import static
 from account.views import registration_view, login_view, logout_view
 
 urlpatterns = [
@@ -28,9 +28,9 @@ urlpatterns = [
     path('logout/', logout_view, name='logout_view'),
     path('login/', login_view, name='login_view'),
     path('accounts/login/', login_view),
-    path('', main_page)
+    path('reservations/slots/', reservation_slots, name='reservation_slots'),
+    path('csrf/', csrf_token, name='csrf_token'),
+    path(f"{settings.MEDIA_URL.lstrip('/')}<path:path>", serve_media, name='media'),
+    path('', main_page_async if settings.ASYNC_MAIN_PAGE else main_page, name='main_page')
 ]
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-
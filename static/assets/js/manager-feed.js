@@ -0,0 +1,76 @@
+/**
+ * Live feed of new requests on the manager pages.
+ * Long polls data-feed-url of #feed-rows and puts new requests on the top of the list.
+ */
+(function() {
+  "use strict";
+
+  const container = document.getElementById('feed-rows')
+  if (!container) {
+    return
+  }
+  const columns = container.dataset.columns.split(',')
+
+  const column = (text, size = 3) => {
+    const div = document.createElement('div')
+    div.className = `col-md-${size}`
+    div.textContent = text
+    return div
+  }
+
+  const format = (item, name) => {
+    const value = item[name]
+    if (name === 'date_reservation') {
+      return value.split('-').reverse().join('.')
+    }
+    if (name === 'time_reservation') {
+      return item.is_waitlisted ? `${value.slice(0, 5)} (waitlist)` : value.slice(0, 5)
+    }
+    if (name === 'date_of_the_request') {
+      return new Date(value).toLocaleString()
+    }
+    return value
+  }
+
+  const render = (item) => {
+    const row = document.createElement('div')
+    row.className = 'row'
+    const actions = column('')
+    const checkbox = document.createElement('input')
+    checkbox.type = 'checkbox'
+    checkbox.name = 'pk'
+    checkbox.value = item.pk
+    const link = document.createElement('a')
+    link.href = container.dataset.updateUrl.replace(/0$/, item.pk)
+    const button = document.createElement('button')
+    button.type = 'button'
+    button.className = 'btn btn-primary'
+    button.textContent = container.dataset.action
+    link.append(button)
+    actions.append(checkbox, ' ', link)
+    row.append(actions)
+    columns.forEach(name => row.append(column(format(item, name))))
+
+    const message = document.createElement('div')
+    message.className = 'row'
+    message.append(column(''), column(item.message, 9))
+    container.prepend(row, message)
+  }
+
+  const poll = async (after) => {
+    const url = after === null ? container.dataset.feedUrl : `${container.dataset.feedUrl}?after=${after}`
+    try {
+      const response = await fetch(url, {credentials: 'same-origin'})
+      if (!response.ok) {
+        return
+      }
+      const data = await response.json()
+      data.items.forEach(render)
+      poll(data.after)
+    } catch (error) {
+      setTimeout(() => poll(after), 5000)
+    }
+  }
+
+  poll(null)
+})()